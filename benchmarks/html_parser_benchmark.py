@@ -0,0 +1,80 @@
+import argparse
+import os
+import time
+
+from constants import BEATSTATS_LIST_GENRE_URL, USER_AGENTS, REQUEST_TIMEOUT
+from enums import BeatstatsGenre, HtmlParserBackend, TypeLink
+from loggers import AppLogger
+from scrappers import HttpClient
+from scrappers.html_parsers import HtmlParser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+FIXTURE_URLS = {
+    f'beatstats_{genre.name.lower()}.html': f'{BEATSTATS_LIST_GENRE_URL}{genre.value}' for genre in BeatstatsGenre
+}
+FIXTURE_URLS.update({
+    'bandcamp_search_techno.html': f'{TypeLink.BANDCAMP_URL.value}/search?q=techno&item_type=b&from=results',
+    'bandcamp_search_records.html': f'{TypeLink.BANDCAMP_URL.value}/search?q=records&item_type=b&from=results',
+})
+
+
+def fetch_fixtures(logger):
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for file_name, url in FIXTURE_URLS.items():
+        response = HttpClient.get_session().get(url, headers={'User-Agent': USER_AGENTS[0]}, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            logger.warning(f'Could not fetch {url}: status {response.status_code}')
+            continue
+        with open(os.path.join(FIXTURES_DIR, file_name), 'wb') as fixture:
+            fixture.write(response.content)
+        logger.info(f'Saved {file_name} ({len(response.content)} bytes)')
+
+
+def load_fixtures():
+    fixtures = []
+    if not os.path.isdir(FIXTURES_DIR):
+        return fixtures
+    for file_name in sorted(os.listdir(FIXTURES_DIR)):
+        if file_name.endswith('.html'):
+            with open(os.path.join(FIXTURES_DIR, file_name), 'rb') as fixture:
+                fixtures.append((file_name, fixture.read()))
+    return fixtures
+
+
+def run_benchmark(logger, iterations):
+    fixtures = load_fixtures()
+    if not fixtures:
+        logger.warning(f'No fixtures found in {FIXTURES_DIR}. Run with --fetch first.')
+        return
+    reference = {}
+    for backend in HtmlParserBackend:
+        parser = HtmlParser.create(backend.value)
+        if parser.backend != backend.value:
+            logger.warning(f'Skipping {backend.value}: backend not installed')
+            continue
+        for file_name, content in fixtures:
+            parse = parser.parse_beatstats if file_name.startswith('beatstats') else parser.parse_bandcamp
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                records = parse(content)
+            elapsed_ms = (time.perf_counter() - started_at) * 1000 / iterations
+            expected = reference.setdefault(file_name, records)
+            status = 'OK' if records == expected else 'MISMATCH'
+            logger.info(f'{backend.value:<12} {file_name:<45} {elapsed_ms:8.2f} ms/page '
+                        f'{len(records):4d} records {status}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HTML parser backends on saved Beatstats/Bandcamp pages.')
+    parser.add_argument('--fetch', action='store_true', help='download fresh fixtures before benchmarking')
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+    logger = AppLogger.get_logger()
+    if args.fetch:
+        fetch_fixtures(logger)
+        HttpClient.close()
+    run_benchmark(logger, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,6 @@ MAX_RETRIES = 3
 CREDENTIALS_FILE = 'F:\Bureau\TechnoLabelScapper\credentials.json'
 SPREADSHEET_ID = '134ilr5ikGxh3nvTAy4jJL5JZvwZLmCTqpgN8cgZ85yU'
 LABELS_SHEET_TITLE = 'Labels'
-LABEL_NAME_ROW = 'A'
 SONGSTATS_URL = 'https://songstats.com'
 SONGSTATS_API_URL = 'https://data.songstats.com/api/v1/search/search_all?q='
 USER_AGENTS = [
@@ -23,4 +22,86 @@ BEATPORT_SCRIPT_ID = '__NEXT_DATA__'
 ACTIF_MINIMUM_RELEASES_NUMBER = 10
 ARTISTS_MINIMUM_NUMBER = 3
 SOUNDCLOUD_SCRIPT_ID = 'window.__sc_hydration'
-BEATSTATS_LIST_GENRE_URL = 'https://www.beatstats.com/labels/home/list?genre='
\ No newline at end of file
+BEATSTATS_LIST_GENRE_URL = 'https://www.beatstats.com/labels/home/list?genre='
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = THREADS_NUMBER * 2
+FETCH_ENGINE = 'threads'
+ASYNC_MAX_CONCURRENCY = 200
+ASYNC_LIMIT_PER_HOST = 100
+REQUEST_TIMEOUT = 30
+RATE_LIMITER_INITIAL_RATE = 2.0
+RATE_LIMITER_MIN_RATE = 0.2
+RATE_LIMITER_MAX_RATE = 20.0
+RATE_LIMITER_BURST = 5
+RATE_LIMITER_INCREASE_STEP = 0.1
+RATE_LIMITER_DECREASE_FACTOR = 0.5
+CACHE_ENABLED = True
+CACHE_DB_FILE = 'cache/http_cache.sqlite3'
+CACHE_MAX_SIZE_BYTES = 512 * 1024 * 1024
+CACHE_TTL_SECONDS = {
+    'BEATPORT_URL': 24 * 3600,
+    'SOUNDCLOUD_URL': 24 * 3600,
+    'BEATSTATS_URL': 6 * 3600,
+    'BANDCAMP_URL': 7 * 24 * 3600
+}
+HTML_PARSER_BACKEND = 'html.parser'
+BEATSTATS_CONTENT_ID = 'content-artists'
+BEATSTATS_LABEL_NAME_CLASS = 'labelcharttextname'
+BEATSTATS_POSITION_ID = 'top10artistchart-number'
+BANDCAMP_RESULT_CLASS = 'result-info'
+STREAMING_FETCH_ENABLED = True
+STREAMED_TYPE_LINKS = ['BEATPORT_URL', 'SOUNDCLOUD_URL']
+STREAM_CHUNK_SIZE = 16 * 1024
+BEATPORT_SCAN_MODE = 'scan'
+BEATPORT_SCAN_PAGE_SIZE = 25
+BEATPORT_SCAN_MAX_PAGES = 4
+BEATPORT_FULL_PAGE_SIZE = 100
+BEATPORT_MAX_PAGES = 20
+BEATPORT_FULL_SCAN_THREADS = 4
+BROWSER_POOL_MAX_CONTEXTS = THREADS_NUMBER
+BROWSER_PAGE_MAX_USES = 50
+SONGSTATS_ENGINE = 'threads'
+SONGSTATS_ASYNC_MAX_PAGES = 20
+SONGSTATS_SEARCH_MODE = 'api'
+SONGSTATS_SESSION_TTL_SECONDS = 30 * 60
+SONGSTATS_API_LIMITER = 'SONGSTATS_API'
+PLAYWRIGHT_RESOURCE_BLOCKING_ENABLED = True
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = ['image', 'media', 'font']
+PLAYWRIGHT_ALLOWED_HOSTS = ['songstats.com']
+SONGSTATS_LABEL_DEADLINE_MS = 8000
+SONGSTATS_READY_POLL_MS = 250
+SONGSTATS_READY_STABLE_POLLS = 4
+SONGSTATS_LABEL_HEADER_SELECTOR = 'div[style*="display: flex; flex-direction: column; align-items: center;"]'
+SONGSTATS_COUNTRY_SELECTOR = f'{SONGSTATS_LABEL_HEADER_SELECTOR} > div:last-child > span'
+SONGSTATS_SEARCH_TIMEOUT_MS = 10000
+SONGSTATS_EXTRACTION_MODE = 'dom'
+SONGSTATS_PAYLOAD_HOSTS = ['data.songstats.com']
+SONGSTATS_PAYLOAD_TIMEOUT_MS = 4000
+SONGSTATS_PAYLOAD_POLL_MS = 250
+BROWSER_SERVER_ENABLED = False
+BROWSER_SERVER_PORT = 9222
+BROWSER_SERVER_PROFILE_DIR = 'cache/browser_profile'
+BROWSER_SERVER_STARTUP_TIMEOUT = 15
+SHEETS_MERGE_MAX_COLUMN_GAP = 15
+SHEETS_MERGE_MAX_ROW_GAP = 5
+SHEETS_BACKEND = 'google'
+SHEETS_LOCAL_DB_FILE = 'cache/sheets.sqlite3'
+SHEETS_LOCAL_SEED_FILE = 'cache/labels_seed.csv'
+SHEETS_LOCAL_LATENCY_MS = 0
+SHEETS_LOCAL_ERROR_RATE = 0.0
+SHEETS_LOCAL_REQUESTS_PER_MINUTE = 0
+SHEETS_WRITE_THREADS = 4
+SHEETS_WRITE_REQUESTS_PER_MINUTE = 60
+SHEETS_CHUNK_MAX_BYTES = 1024 * 1024
+SHEETS_CHUNK_MAX_CELLS = 10000
+SHEETS_CHUNK_MAX_RANGES = 500
+SHEETS_WRITE_MAX_ATTEMPTS = 6
+SHEETS_BACKOFF_BASE_SECONDS = 1
+SHEETS_BACKOFF_MAX_SECONDS = 64
+SHEETS_INCREMENTAL_WRITE_ENABLED = True
+SHEETS_FLUSH_BATCH_SIZE = 200
+SHEETS_FLUSH_INTERVAL_SECONDS = 30
+SHEETS_FLUSH_QUEUE_SIZE = 1000
+LABELS_FIRST_ROW = 2
+SHEETS_READ_BLOCK_ROWS = 5000
+SHEETS_READ_MAX_ATTEMPTS = 5
\ No newline at end of file
@@ -2,4 +2,11 @@ from .status_code import StatusCode
 from .operation_system_name import OperationSystemName
 from .menu_action import MenuAction
 from .type_link import TypeLink
-from .beatstats_genre import BeatstatsGenre
\ No newline at end of file
+from .beatstats_genre import BeatstatsGenre
+from .fetch_engine import FetchEngine
+from .html_parser_backend import HtmlParserBackend
+from .beatport_scan_mode import BeatportScanMode
+from .songstats_search_mode import SongstatsSearchMode
+from .songstats_extraction_mode import SongstatsExtractionMode
+from .sheets_backend import SheetsBackend
+from .label_column import LabelColumn
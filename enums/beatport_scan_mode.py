@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class BeatportScanMode(Enum):
+    SCAN = 'scan'
+    FULL = 'full'
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class FetchEngine(Enum):
+    THREADS = 'threads'
+    ASYNCIO = 'asyncio'
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class HtmlParserBackend(Enum):
+    HTML_PARSER = 'html.parser'
+    LXML = 'lxml'
+    SELECTOLAX = 'selectolax'
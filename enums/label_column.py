@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class LabelColumn(Enum):
+    NAME = 'A'
+    COUNTRY = 'B'
+    GENRE = 'C'
+    ACTIF = 'D'
+    OUVERT_NOUVEAUX = 'E'
+    EMAIL_DEMO = 'F'
+    SOUNDCLOUD_FOLLOWERS = 'N'
+    SOUNDCLOUD_URL = 'O'
+    FACEBOOK_URL = 'P'
+    INSTAGRAM_URL = 'Q'
+    BEATPORT_URL = 'R'
+    BANDCAMP_URL = 'S'
+    POSITION = 'T'
+    SONGSTATS_FLAG = 'U'
+    BEATSTATS_FLAG = 'V'
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class SheetsBackend(Enum):
+    GOOGLE = 'google'
+    MEMORY = 'memory'
+    SQLITE = 'sqlite'
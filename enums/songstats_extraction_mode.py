@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class SongstatsExtractionMode(Enum):
+    NETWORK = 'network'
+    DOM = 'dom'
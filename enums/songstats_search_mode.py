@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class SongstatsSearchMode(Enum):
+    API = 'api'
+    BROWSER = 'browser'
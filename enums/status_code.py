@@ -3,5 +3,8 @@ from enum import Enum
 
 class StatusCode(Enum):
     SUCCESS = 200
+    NOT_MODIFIED = 304
+    UNAUTHORIZED = 401
     FORBIDDEN = 403
     TOO_MANY_REQUESTS = 429
+    SERVICE_UNAVAILABLE = 503
@@ -1,7 +1,8 @@
-from .beatport_manager import BeatportManager
+from .beatport_manager import BeatportManager, AsyncBeatportManager
 from .google_sheets_manager import GoogleSheetsManager
-from .songstats_manager import SongstatsManager
-from .beatport_manager import BeatportManager
-from .soundcloud_manager import SoundcloudManager
-from .beatstats_manager import BeatstatsManager
-from .bandcamp_manager import BandcampManager
\ No newline at end of file
+from .songstats_manager import SongstatsManager, AsyncSongstatsManager
+from .soundcloud_manager import SoundcloudManager, AsyncSoundcloudManager
+from .beatstats_manager import BeatstatsManager, AsyncBeatstatsManager
+from .bandcamp_manager import BandcampManager, AsyncBandcampManager
+from .local_sheets_service import LocalSheetsService
+from .sheets_flusher import SheetsFlusher
@@ -1,21 +1,36 @@
+import asyncio
+import math
+import threading
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-from constants import ACTIF_MINIMUM_RELEASES_NUMBER, NON, ARTISTS_MINIMUM_NUMBER, OUI
-from enums import TypeLink
+from constants import ACTIF_MINIMUM_RELEASES_NUMBER, NON, ARTISTS_MINIMUM_NUMBER, OUI, BEATPORT_SCAN_MODE, \
+    BEATPORT_SCAN_PAGE_SIZE, BEATPORT_FULL_PAGE_SIZE, BEATPORT_MAX_PAGES, BEATPORT_FULL_SCAN_THREADS, \
+    BEATPORT_SCAN_MAX_PAGES
+from enums import TypeLink, BeatportScanMode
 from loggers import AppLogger
-from scrappers import RequestsHelper
+from scrappers import RequestsHelper, AsyncRequestsHelper
 
 
 class BeatportManager:
-    def __init__(self):
+    _page_executor = None
+    _page_executor_lock = threading.Lock()
+
+    def __init__(self, helper: RequestsHelper = None, scan_mode: str = BEATPORT_SCAN_MODE):
         self.logger = AppLogger().get_logger()
-        self.helper = RequestsHelper()
+        self.helper = helper or RequestsHelper()
+        self.scan_mode = scan_mode
 
     def get_beatport_info(self, url, label_name):
-        release_url = self._generate_release_url(url)
-        data = self.helper.scrap_with_requests(release_url, TypeLink.BEATPORT_URL)
-        if release_info := self._get_last_releases_info(data):
+        if self.scan_mode == BeatportScanMode.FULL.value:
+            releases = self._fetch_all_releases(url)
+        else:
+            releases = self._scan_releases(url)
+        return self._build_beatport_info(releases, label_name)
+
+    def _build_beatport_info(self, releases, label_name):
+        if release_info := self._get_last_releases_info(releases):
             releases_number = release_info.get('releases_number', 0)
             artists_number = release_info.get('artists_number', 0)
             return {'name': label_name,
@@ -29,20 +44,93 @@ class BeatportManager:
         start_date = end_date - timedelta(days=365)
         return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
 
-    def _generate_release_url(self, url):
+    def _generate_release_url(self, url, page=1, per_page=BEATPORT_FULL_PAGE_SIZE):
         start_date, end_date = self.get_date_range()
-        release_url = f'{url}/releases?publish_date={start_date}%3A{end_date}&page=1&per_page=100'
+        release_url = f'{url}/releases?publish_date={start_date}%3A{end_date}&page={page}&per_page={per_page}'
         return release_url
 
-    def _get_last_releases_info(self, data):
+    def _scan_releases(self, url):
+        releases, count = self._fetch_release_page(url, 1, BEATPORT_SCAN_PAGE_SIZE)
+        if self._is_decided(releases) or self._is_last_page(1, BEATPORT_SCAN_PAGE_SIZE, len(releases), count):
+            return releases
+        if self._exceeds_scan_window(count):
+            return self._fetch_full_pages(url, count, first_page=1)
+        for page_releases in self._iter_release_pages(url, BEATPORT_SCAN_PAGE_SIZE, first_page=2):
+            releases.extend(page_releases)
+            if self._is_decided(releases):
+                break
+        return releases
+
+    def _iter_release_pages(self, url, per_page, first_page=1):
+        for page in range(first_page, self._get_max_pages(per_page) + 1):
+            page_releases, count = self._fetch_release_page(url, page, per_page)
+            yield page_releases
+            if self._is_last_page(page, per_page, len(page_releases), count):
+                return
+
+    def _fetch_all_releases(self, url):
+        releases, count = self._fetch_release_page(url, 1, BEATPORT_FULL_PAGE_SIZE)
+        if self._is_last_page(1, BEATPORT_FULL_PAGE_SIZE, len(releases), count):
+            return releases
+        if count is None:
+            for page_releases in self._iter_release_pages(url, BEATPORT_FULL_PAGE_SIZE, first_page=2):
+                releases.extend(page_releases)
+            return releases
+        return releases + self._fetch_full_pages(url, count, first_page=2)
+
+    def _fetch_full_pages(self, url, count, first_page):
+        releases = []
+        pages = self._get_page_executor().map(lambda page: self._fetch_release_page(url, page, BEATPORT_FULL_PAGE_SIZE),
+                                              self._get_remaining_pages(count, BEATPORT_FULL_PAGE_SIZE, first_page))
+        for page_releases, _ in pages:
+            releases.extend(page_releases)
+        return releases
+
+    @staticmethod
+    def _get_page_executor():
+        if BeatportManager._page_executor is None:
+            with BeatportManager._page_executor_lock:
+                if BeatportManager._page_executor is None:
+                    BeatportManager._page_executor = ThreadPoolExecutor(max_workers=BEATPORT_FULL_SCAN_THREADS,
+                                                                        thread_name_prefix='beatport-pages')
+        return BeatportManager._page_executor
+
+    def _fetch_release_page(self, url, page, per_page):
+        data = self.helper.scrap_with_requests(self._generate_release_url(url, page, per_page), TypeLink.BEATPORT_URL)
+        return self._get_releases_page(data)
+
+    @staticmethod
+    def _get_releases_page(data):
         if data is None:
-            return {'releases_number': 0, 'artists_number': 0, 'artists': None}
+            return [], None
         if not isinstance(data, dict):
             raise TypeError('Data must be a dict.')
-        releases = data.get('props', {}).get('pageProps', {}).get('dehydratedState', {}).get('queries', [{}])[1].get(
-            'state',
-            {}).get(
-            'data', {}).get('results', [])
+        queries = data.get('props', {}).get('pageProps', {}).get('dehydratedState', {}).get('queries', [{}])
+        releases_data = (queries[1] if len(queries) > 1 else {}).get('state', {}).get('data', {}) or {}
+        return releases_data.get('results', []) or [], releases_data.get('count')
+
+    @staticmethod
+    def _get_max_pages(per_page):
+        return math.ceil(BEATPORT_MAX_PAGES * BEATPORT_FULL_PAGE_SIZE / per_page)
+
+    @staticmethod
+    def _is_last_page(page, per_page, page_size, count):
+        return (page_size < per_page or (count is not None and page * per_page >= count)
+                or page >= BeatportManager._get_max_pages(per_page))
+
+    @staticmethod
+    def _exceeds_scan_window(count):
+        return count is not None and count > BEATPORT_SCAN_PAGE_SIZE * BEATPORT_SCAN_MAX_PAGES
+
+    @staticmethod
+    def _get_remaining_pages(count, per_page, first_page=2):
+        return range(first_page, min(math.ceil(count / per_page), BeatportManager._get_max_pages(per_page)) + 1)
+
+    def _is_decided(self, releases):
+        return (len(releases) > ACTIF_MINIMUM_RELEASES_NUMBER
+                and len(self._count_unique_artists(releases)) > ARTISTS_MINIMUM_NUMBER)
+
+    def _get_last_releases_info(self, releases):
         if releases:
             artists = self._count_unique_artists(releases)
             return {'releases_number': len(releases), 'artists_number': len(artists), 'artists': artists}
@@ -54,3 +142,58 @@ class BeatportManager:
         for release in releases:
             artists.extend([artist['name'] for artist in release.get('artists', [])])
         return Counter(artists)
+
+
+class AsyncBeatportManager(BeatportManager):
+    def __init__(self, helper: AsyncRequestsHelper, scan_mode: str = BEATPORT_SCAN_MODE):
+        super().__init__(helper, scan_mode)
+
+    async def get_beatport_info(self, url, label_name):
+        if self.scan_mode == BeatportScanMode.FULL.value:
+            releases = await self._fetch_all_releases_async(url)
+        else:
+            releases = await self._scan_releases_async(url)
+        return self._build_beatport_info(releases, label_name)
+
+    async def _scan_releases_async(self, url):
+        releases, count = await self._fetch_release_page_async(url, 1, BEATPORT_SCAN_PAGE_SIZE)
+        if self._is_decided(releases) or self._is_last_page(1, BEATPORT_SCAN_PAGE_SIZE, len(releases), count):
+            return releases
+        if self._exceeds_scan_window(count):
+            return await self._fetch_full_pages_async(url, count, first_page=1)
+        async for page_releases in self._iter_release_pages_async(url, BEATPORT_SCAN_PAGE_SIZE, first_page=2):
+            releases.extend(page_releases)
+            if self._is_decided(releases):
+                break
+        return releases
+
+    async def _iter_release_pages_async(self, url, per_page, first_page=1):
+        for page in range(first_page, self._get_max_pages(per_page) + 1):
+            page_releases, count = await self._fetch_release_page_async(url, page, per_page)
+            yield page_releases
+            if self._is_last_page(page, per_page, len(page_releases), count):
+                return
+
+    async def _fetch_all_releases_async(self, url):
+        releases, count = await self._fetch_release_page_async(url, 1, BEATPORT_FULL_PAGE_SIZE)
+        if self._is_last_page(1, BEATPORT_FULL_PAGE_SIZE, len(releases), count):
+            return releases
+        if count is None:
+            async for page_releases in self._iter_release_pages_async(url, BEATPORT_FULL_PAGE_SIZE, first_page=2):
+                releases.extend(page_releases)
+            return releases
+        return releases + await self._fetch_full_pages_async(url, count, first_page=2)
+
+    async def _fetch_full_pages_async(self, url, count, first_page):
+        releases = []
+        page_numbers = self._get_remaining_pages(count, BEATPORT_FULL_PAGE_SIZE, first_page)
+        pages = await asyncio.gather(*(self._fetch_release_page_async(url, page, BEATPORT_FULL_PAGE_SIZE)
+                                       for page in page_numbers))
+        for page_releases, _ in pages:
+            releases.extend(page_releases)
+        return releases
+
+    async def _fetch_release_page_async(self, url, page, per_page):
+        data = await self.helper.scrap_with_requests(self._generate_release_url(url, page, per_page),
+                                                     TypeLink.BEATPORT_URL)
+        return self._get_releases_page(data)
@@ -1,56 +1,195 @@
-from time import sleep
+import bisect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from google.oauth2.credentials import Credentials
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-from constants import OUI, NON, MAX_RETRIES
-from enums import TypeLink
+from constants import OUI, NON, SHEETS_MERGE_MAX_COLUMN_GAP, SHEETS_MERGE_MAX_ROW_GAP, SHEETS_BACKEND, \
+    SHEETS_CHUNK_MAX_RANGES, LABELS_SHEET_TITLE, LABELS_FIRST_ROW, SHEETS_READ_BLOCK_ROWS, \
+    SHEETS_READ_MAX_ATTEMPTS
+from enums import TypeLink, SheetsBackend, LabelColumn, StatusCode
 from loggers import AppLogger
+from models import LabelTable, LINK_COLUMNS, SONGSTATS_UPDATE_COLUMNS, LINKS_UPDATE_COLUMNS, VINYLS_UPDATE_COLUMNS, \
+    BEATSTATS_UPDATE_COLUMNS, BEATSTATS_NEW_LABEL_COLUMNS
+from utils.utils import parse_a1_range, index_to_column, to_typed_cell_value
+from .local_sheets_service import LocalSheetsService
+from .sheets_writer import SheetsWriter
 
 
 class GoogleSheetsManager:
-    def __init__(self, credentials_file, spreadsheet_id):
+    def __init__(self, credentials_file, spreadsheet_id, backend=SHEETS_BACKEND):
         self.logger = AppLogger.get_logger()
         self.spreadsheet_id = spreadsheet_id
-        self.service = self._authenticate(credentials_file)
+        self.snapshot = {}
+        self.snapshot_rows = []
+        self.snapshot_lock = threading.Lock()
+        self.skipped_cells = 0
+        self.credentials = None
+        self.local = threading.local()
+        if backend == SheetsBackend.GOOGLE.value:
+            self.service = self._authenticate(credentials_file)
+        else:
+            self.logger.info(f'Using local {backend} Google Sheets backend')
+            self.service = LocalSheetsService.create(backend)
+        self.local.service = self.service
+        self.writer = SheetsWriter(self.get_thread_service, spreadsheet_id)
 
     def _authenticate(self, credentials_file):
         try:
-            credentials = Credentials.from_service_account_file(credentials_file,
-                                                                scopes=['https://www.googleapis.com/auth/spreadsheets'])
-            return build('sheets', 'v4', credentials=credentials)
+            self.credentials = Credentials.from_service_account_file(
+                credentials_file, scopes=['https://www.googleapis.com/auth/spreadsheets'])
+            return build('sheets', 'v4', credentials=self.credentials)
         except Exception as e:
             self.logger.error(f'Authentication failed: {e}')
             raise
 
-    def read_columns(self, range_name):
-        try:
-            ranges = range_name.split(',')
-            batch_result = self.service.spreadsheets().values().batchGet(
-                spreadsheetId=self.spreadsheet_id,
-                ranges=ranges
-            ).execute()
-            value_ranges = batch_result.get('valueRanges', [])
-            merged_data = []
-            max_rows = max(len(vr.get('values', [])) for vr in value_ranges)
-
-            start_row = int(ranges[0].split('!')[1].split(':')[0][1:]) if ranges else 1
-
-            for row_index in range(max_rows):
-                merged_row = [start_row + row_index]
-                for vr in value_ranges:
-                    values = vr.get('values', [])
-                    if row_index < len(values):
-                        merged_row.append(values[row_index][0] if values[row_index] else '')
-                    else:
-                        merged_row.append('')
-                merged_data.append(merged_row)
-            return merged_data
-        except Exception as e:
-            self.logger.error(f'Error reading columns {range_name}: {e}')
+    def get_thread_service(self):
+        service = getattr(self.local, 'service', None)
+        if service is None:
+            service = build('sheets', 'v4', credentials=self.credentials) if self.credentials else self.service
+            self.local.service = service
+        return service
+
+    def read_columns(self, columns, snapshot_columns=()):
+        return self._read_table(columns, LABELS_FIRST_ROW, snapshot_columns=snapshot_columns)
+
+    def iter_column_blocks(self, columns, block_rows=SHEETS_READ_BLOCK_ROWS, snapshot_columns=()):
+        row_count = self.get_row_count()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = []
+            for start_row in range(LABELS_FIRST_ROW, row_count + 1, block_rows):
+                end_row = min(start_row + block_rows - 1, row_count)
+                pending.append(executor.submit(self._read_table, columns, start_row, end_row, snapshot_columns))
+                if len(pending) > 1:
+                    yield from self._get_read_block(pending.pop(0))
+            for future in pending:
+                yield from self._get_read_block(future)
+
+    def _get_read_block(self, future):
+        table = future.result()
+        if not len(table):
             return []
+        self.logger.info(f'Read rows {table.start_row}-{table.get_last_row()} from the sheet')
+        return [table]
+
+    def iter_columns(self, columns, block_rows=SHEETS_READ_BLOCK_ROWS, snapshot_columns=()):
+        for table in self.iter_column_blocks(columns, block_rows, snapshot_columns):
+            yield from table
+
+    def get_row_count(self):
+        result = self._execute_read(lambda: self.get_thread_service().spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id, fields='sheets.properties'))
+        for sheet in result.get('sheets', []):
+            properties = sheet.get('properties', {})
+            if properties.get('title') == LABELS_SHEET_TITLE:
+                return properties.get('gridProperties', {}).get('rowCount', 0)
+        raise ValueError(f'Sheet {LABELS_SHEET_TITLE} not found in spreadsheet {self.spreadsheet_id}')
+
+    def _read_table(self, columns, start_row, end_row=None, snapshot_columns=()):
+        end = end_row or ''
+        ranges = [f'{LABELS_SHEET_TITLE}!{column.value}{start_row}:{column.value}{end}' for column in columns]
+        batch_result = self._execute_read(lambda: self.get_thread_service().spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=ranges,
+            majorDimension='COLUMNS',
+            valueRenderOption='UNFORMATTED_VALUE'
+        ))
+        table = LabelTable.from_value_ranges(columns, batch_result.get('valueRanges', []), start_row)
+        self._store_snapshot(table, snapshot_columns)
+        return table
+
+    def _execute_read(self, build_request):
+        for attempt in range(SHEETS_READ_MAX_ATTEMPTS):
+            try:
+                return build_request().execute()
+            except HttpError as e:
+                status = e.resp.status
+                if (status != StatusCode.TOO_MANY_REQUESTS.value and status < 500) \
+                        or attempt == SHEETS_READ_MAX_ATTEMPTS - 1:
+                    self.logger.error(f'HTTP error occurred while reading the sheet: {e}')
+                    raise
+                self.logger.warning(f'HTTP error occurred while reading the sheet '
+                                    f'(attempt {attempt + 1}/{SHEETS_READ_MAX_ATTEMPTS}): {e}')
+            time.sleep(SheetsWriter.get_backoff(attempt))
+
+    def _store_snapshot(self, table, columns):
+        snapshot = table.copy(columns)
+        if not snapshot.columns:
+            return
+        with self.snapshot_lock:
+            if table.start_row not in self.snapshot:
+                bisect.insort(self.snapshot_rows, table.start_row)
+            self.snapshot[table.start_row] = snapshot
+
+    def drop_unchanged_updates(self, updates):
+        changed = []
+        with self.snapshot_lock:
+            for update in updates:
+                cell = self._get_cell_key(update)
+                if cell is not None and self._is_unchanged(self._get_snapshot_value(*cell), update['values'][0][0]):
+                    continue
+                changed.append(update)
+        skipped = len(updates) - len(changed)
+        self.skipped_cells += skipped
+        self.logger.info(f'Skipped {skipped} unchanged cells out of {len(updates)} updates')
+        return changed
+
+    def _get_snapshot_value(self, row, column):
+        table = self._get_snapshot_table(row)
+        return table.get_cell(row, column) if table else None
+
+    def _get_snapshot_table(self, row):
+        index = bisect.bisect_right(self.snapshot_rows, row) - 1
+        return self.snapshot[self.snapshot_rows[index]] if index >= 0 else None
+
+    def _update_snapshot(self, updates):
+        with self.snapshot_lock:
+            for update in updates:
+                for row, column, value in self._iter_update_cells(update):
+                    if table := self._get_snapshot_table(row):
+                        table.set_cell(row, column, value)
+
+    @staticmethod
+    def _iter_update_cells(update):
+        try:
+            sheet, start_col, start_row, _, _ = parse_a1_range(update['range'])
+        except ValueError:
+            return
+        if sheet != LABELS_SHEET_TITLE or None in (start_col, start_row):
+            return
+        for row_offset, values in enumerate(update.get('values', [])):
+            for col_offset, value in enumerate(values):
+                try:
+                    column = LabelColumn(index_to_column(start_col + col_offset))
+                except ValueError:
+                    continue
+                if value is not None:
+                    yield start_row + row_offset, column, value
+
+    @staticmethod
+    def _get_cell_key(update):
+        try:
+            sheet, col, row, end_col, end_row = parse_a1_range(update['range'])
+            column = LabelColumn(index_to_column(col))
+        except (ValueError, TypeError):
+            return None
+        values = update.get('values', [])
+        if sheet != LABELS_SHEET_TITLE or (col, row) != (end_col, end_row) or len(values) != 1 or len(values[0]) != 1:
+            return None
+        return row, column
+
+    @staticmethod
+    def _is_unchanged(current_value, new_value):
+        return current_value is not None and to_typed_cell_value(current_value) == to_typed_cell_value(new_value)
+
+    @staticmethod
+    def _build_cell_updates(row, columns, values):
+        return [{'range': f'{LABELS_SHEET_TITLE}!{column.value}{row}', 'values': [[values[column]]]}
+                for column in columns]
 
     def prepare_batch_updates_for_songstats(self, labels_in_success):
         updates = []
@@ -58,16 +197,12 @@ class GoogleSheetsManager:
             try:
                 row = success_info['row']
                 label_info = success_info['label']
-                column_updates = [
-                    {'range': f'Labels!B{row}', 'values': [[label_info.get('country', '')]]},
-                    {'range': f'Labels!O{row}',
-                     'values': [[label_info['links'].get(TypeLink.SOUNDCLOUD_URL.name, '')]]},
-                    {'range': f'Labels!P{row}', 'values': [[label_info['links'].get(TypeLink.FACEBOOK_URL.name, '')]]},
-                    {'range': f'Labels!Q{row}', 'values': [[label_info['links'].get(TypeLink.INSTAGRAM_URL.name, '')]]},
-                    {'range': f'Labels!R{row}', 'values': [[label_info['links'].get(TypeLink.BEATPORT_URL.name, '')]]},
-                    {'range': f'Labels!U{row}', 'values': [[OUI]]}
-                ]
-                updates.extend(column_updates)
+                values = {
+                    LabelColumn.COUNTRY: label_info.get('country', ''),
+                    **{column: label_info['links'].get(column.name, '') for column in LINK_COLUMNS},
+                    LabelColumn.SONGSTATS_FLAG: OUI
+                }
+                updates.extend(self._build_cell_updates(row, SONGSTATS_UPDATE_COLUMNS, values))
                 self.logger.debug(f"Prepared updates for label: {label_info.get('name', 'Unknown')} at row {row}")
             except KeyError as e:
                 self.logger.error(f'KeyError while preparing update: {str(e)}. Label info: {success_info}')
@@ -82,13 +217,13 @@ class GoogleSheetsManager:
             try:
                 row = success_info['row']
                 label_info = success_info['label']
-                column_updates = [
-                    {'range': f'Labels!D{row}', 'values': [[label_info.get('actif', NON)]]},
-                    {'range': f'Labels!E{row}', 'values': [[label_info.get('ouvert_nouveaux', NON)]]},
-                    {'range': f'Labels!F{row}', 'values': [[label_info.get('email_demo', '')]]},
-                    {'range': f'Labels!N{row}', 'values': [[label_info.get('soundcloud_followers', '')]]},
-                ]
-                updates.extend(column_updates)
+                values = {
+                    LabelColumn.ACTIF: label_info.get('actif', NON),
+                    LabelColumn.OUVERT_NOUVEAUX: label_info.get('ouvert_nouveaux', NON),
+                    LabelColumn.EMAIL_DEMO: label_info.get('email_demo', ''),
+                    LabelColumn.SOUNDCLOUD_FOLLOWERS: label_info.get('soundcloud_followers', '')
+                }
+                updates.extend(self._build_cell_updates(row, LINKS_UPDATE_COLUMNS, values))
                 self.logger.debug(f"Prepared updates for label: {label_info.get('name', 'Unknown')} at row {row}")
             except KeyError as e:
                 self.logger.error(f'KeyError while preparing update: {str(e)}. Label info: {success_info}')
@@ -103,11 +238,11 @@ class GoogleSheetsManager:
             try:
                 row = success_info['row']
                 label_info = success_info['label']
-                column_updates = [
-                    {'range': f'Labels!B{row}', 'values': [[label_info.get('country', '')]]},
-                    {'range': f'Labels!S{row}', 'values': [[label_info.get(TypeLink.BANDCAMP_URL.name, '')]]},
-                ]
-                updates.extend(column_updates)
+                values = {
+                    LabelColumn.COUNTRY: label_info.get('country', ''),
+                    LabelColumn.BANDCAMP_URL: label_info.get(TypeLink.BANDCAMP_URL.name, '')
+                }
+                updates.extend(self._build_cell_updates(row, VINYLS_UPDATE_COLUMNS, values))
                 self.logger.debug(f"Prepared updates for label: {label_info.get('name', 'Unknown')} at row {row}")
             except KeyError as e:
                 self.logger.error(f'KeyError while preparing update: {str(e)}. Label info: {success_info}')
@@ -121,23 +256,15 @@ class GoogleSheetsManager:
         for label in labels:
             try:
                 row = label['row']
-                update_label = label.get('update_label', False)
-                if update_label:
-                    column_updates = [
-                        {'range': f'Labels!C{row}', 'values': [[label.get('genre', '')]]},
-                        {'range': f'Labels!T{row}', 'values': [[label.get('position', '')]]},
-                        {'range': f'Labels!V{row}', 'values': [[OUI]]}
-                    ]
-                    updates.extend(column_updates)
-                else:
-                    column_updates = [
-                        {'range': f'Labels!A{row}', 'values': [[label.get('name', '')]]},
-                        {'range': f'Labels!C{row}', 'values': [[label.get('genre', '')]]},
-                        {'range': f'Labels!R{row}', 'values': [[label.get(TypeLink.BEATPORT_URL.name, '')]]},
-                        {'range': f'Labels!T{row}', 'values': [[label.get('position', '')]]},
-                        {'range': f'Labels!V{row}', 'values': [[OUI]]}
-                    ]
-                    updates.extend(column_updates)
+                values = {
+                    LabelColumn.NAME: label.get('name', ''),
+                    LabelColumn.GENRE: label.get('genre', ''),
+                    LabelColumn.BEATPORT_URL: label.get(TypeLink.BEATPORT_URL.name, ''),
+                    LabelColumn.POSITION: label.get('position', ''),
+                    LabelColumn.BEATSTATS_FLAG: OUI
+                }
+                columns = BEATSTATS_UPDATE_COLUMNS if label.get('update_label', False) else BEATSTATS_NEW_LABEL_COLUMNS
+                updates.extend(self._build_cell_updates(row, columns, values))
                 self.logger.debug(f"Prepared updates for label: {label.get('name', 'Unknown')} at row {row}")
             except KeyError as e:
                 self.logger.error(f'KeyError while preparing update: {str(e)}. Label info: {label}')
@@ -146,37 +273,75 @@ class GoogleSheetsManager:
         self.logger.info(f'Prepared {len(updates)} individual column updates for {len(labels)} labels')
         return updates
 
-    def batch_update(self, updates, delay=5):
-        for attempt in range(MAX_RETRIES):
+    def batch_update(self, updates):
+        return self.writer.write_chunk(updates)
+
+    def coalesce_updates(self, updates, max_column_gap=SHEETS_MERGE_MAX_COLUMN_GAP,
+                         max_row_gap=SHEETS_MERGE_MAX_ROW_GAP):
+        cells_by_sheet = {}
+        passthrough = []
+        for update in updates:
             try:
-                body = {
-                    'valueInputOption': 'USER_ENTERED',
-                    'data': updates
-                }
-                result = self.service.spreadsheets().values().batchUpdate(
-                    spreadsheetId=self.spreadsheet_id, body=body).execute()
-                self.logger.info(f"Batch update completed. {result.get('totalUpdatedCells')} cells updated.")
-                return True
-            except HttpError as e:
-                self.logger.error(f'HTTP error occurred during batch update (attempt {attempt + 1}/{MAX_RETRIES}): {e}')
-                if attempt < MAX_RETRIES - 1:
-                    sleep(delay)
-                else:
-                    return False
-            except Exception as e:
-                self.logger.error(f'Unexpected error during batch update (attempt {attempt + 1}/{MAX_RETRIES}): {e}')
-                if attempt < MAX_RETRIES - 1:
-                    sleep(delay)
-                else:
-                    return False
-        return False
-
-    def batch_update_in_chunks(self, updates, chunk_size=500):
-        for i in range(0, len(updates), chunk_size):
-            chunk = updates[i:i + chunk_size]
-            success = self.batch_update(chunk)
-            if not success:
-                self.logger.error(f"Failed to update chunk starting at index {i}")
-                return False
-        return True
+                sheet, col, row, end_col, end_row = parse_a1_range(update['range'])
+            except ValueError:
+                passthrough.append(update)
+                continue
+            values = update.get('values', [])
+            if (col, row) != (end_col, end_row) or None in (col, row) or len(values) != 1 or len(values[0]) != 1:
+                passthrough.append(update)
+                continue
+            cells_by_sheet.setdefault(sheet, {}).setdefault(row, {})[col] = values[0][0]
+
+        merged = []
+        for sheet, cells in cells_by_sheet.items():
+            for block in self._build_blocks(cells, max_column_gap, max_row_gap):
+                merged.append(self._block_to_update(sheet, cells, *block))
+        self.logger.info(f'Coalesced {len(updates) - len(passthrough)} cell updates into {len(merged)} ranges')
+        return merged + passthrough
+
+    @staticmethod
+    def _build_blocks(cells, max_column_gap, max_row_gap):
+        blocks = []
+        current_spans, current_blocks = None, []
+        for row in sorted(cells):
+            spans = GoogleSheetsManager._build_column_spans(sorted(cells[row]), max_column_gap)
+            if spans == current_spans and row - current_blocks[0][3] - 1 <= max_row_gap:
+                for block in current_blocks:
+                    block[3] = row
+                continue
+            current_spans = spans
+            current_blocks = [[start_col, end_col, row, row] for start_col, end_col in spans]
+            blocks.extend(current_blocks)
+        return blocks
+
+    @staticmethod
+    def _build_column_spans(columns, max_column_gap):
+        spans = []
+        span_start = columns[0]
+        for previous, column in zip(columns, columns[1:]):
+            if column - previous - 1 > max_column_gap:
+                spans.append((span_start, previous))
+                span_start = column
+        spans.append((span_start, columns[-1]))
+        return spans
+
+    @staticmethod
+    def _block_to_update(sheet, cells, start_col, end_col, start_row, end_row):
+        prefix = f'{sheet}!' if sheet else ''
+        start_cell = f'{index_to_column(start_col)}{start_row}'
+        end_cell = f'{index_to_column(end_col)}{end_row}'
+        values = [[cells.get(row, {}).get(col) for col in range(start_col, end_col + 1)]
+                  for row in range(start_row, end_row + 1)]
+        cell_range = start_cell if start_cell == end_cell else f'{start_cell}:{end_cell}'
+        return {'range': f'{prefix}{cell_range}', 'values': values}
+
+    def batch_update_in_chunks(self, updates, chunk_size=SHEETS_CHUNK_MAX_RANGES):
+        cell_updates = self.drop_unchanged_updates(updates)
+        if not cell_updates:
+            return True
+        success, written = self.writer.write(self.coalesce_updates(cell_updates), chunk_size)
+        self._update_snapshot(written)
+        if not success:
+            self.logger.error('Some update chunks failed after all retries')
+        return success
 
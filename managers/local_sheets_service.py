@@ -0,0 +1,298 @@
+import csv
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from constants import SHEETS_LOCAL_DB_FILE, SHEETS_LOCAL_LATENCY_MS, SHEETS_LOCAL_ERROR_RATE, \
+    SHEETS_LOCAL_REQUESTS_PER_MINUTE, SHEETS_LOCAL_SEED_FILE, LABELS_SHEET_TITLE
+from enums import SheetsBackend, StatusCode
+from loggers import AppLogger
+from utils.utils import parse_a1_range, index_to_column, to_typed_cell_value
+
+
+class MemorySheetStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sheets: Dict[str, Dict[int, Dict[int, str]]] = {}
+
+    def read(self, sheet: str, start_col: int, start_row: int, end_col: int, end_row: int) -> Dict[tuple, str]:
+        with self.lock:
+            rows = self.sheets.get(sheet, {})
+            return {(row, col): value
+                    for row, columns in rows.items() if start_row <= row <= end_row
+                    for col, value in columns.items() if start_col <= col <= end_col}
+
+    def write(self, sheet: str, cells: Dict[tuple, str]):
+        with self.lock:
+            rows = self.sheets.setdefault(sheet, {})
+            for (row, col), value in cells.items():
+                if value == '':
+                    rows.get(row, {}).pop(col, None)
+                else:
+                    rows.setdefault(row, {})[col] = value
+
+    def get_first_sheet(self) -> str:
+        with self.lock:
+            return next(iter(self.sheets), '')
+
+    def get_sheet_names(self) -> List[str]:
+        with self.lock:
+            return list(self.sheets)
+
+    def get_bounds(self, sheet: str) -> tuple:
+        with self.lock:
+            rows = self.sheets.get(sheet, {})
+            max_row = max((row for row, columns in rows.items() if columns), default=0)
+            max_col = max((col for columns in rows.values() for col in columns), default=0)
+            return max_row, max_col
+
+
+class SqliteSheetStore:
+    def __init__(self, db_file: str = SHEETS_LOCAL_DB_FILE):
+        self.lock = threading.Lock()
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS cells ('
+            'sheet TEXT, row INTEGER, col INTEGER, value TEXT, PRIMARY KEY (sheet, row, col))')
+        self.connection.commit()
+
+    def read(self, sheet: str, start_col: int, start_row: int, end_col: int, end_row: int) -> Dict[tuple, str]:
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT row, col, value FROM cells WHERE sheet = ? AND row BETWEEN ? AND ? AND col BETWEEN ? AND ?',
+                (sheet, start_row, end_row, start_col, end_col)).fetchall()
+        return {(row, col): value for row, col, value in rows}
+
+    def write(self, sheet: str, cells: Dict[tuple, str]):
+        with self.lock:
+            self.connection.executemany(
+                'DELETE FROM cells WHERE sheet = ? AND row = ? AND col = ?',
+                [(sheet, row, col) for (row, col), value in cells.items() if value == ''])
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO cells (sheet, row, col, value) VALUES (?, ?, ?, ?)',
+                [(sheet, row, col, value) for (row, col), value in cells.items() if value != ''])
+            self.connection.commit()
+
+    def get_first_sheet(self) -> str:
+        with self.lock:
+            row = self.connection.execute('SELECT sheet FROM cells ORDER BY rowid LIMIT 1').fetchone()
+        return row[0] if row else ''
+
+    def get_sheet_names(self) -> List[str]:
+        with self.lock:
+            rows = self.connection.execute('SELECT sheet FROM cells GROUP BY sheet ORDER BY MIN(rowid)').fetchall()
+        return [row[0] for row in rows]
+
+    def get_bounds(self, sheet: str) -> tuple:
+        with self.lock:
+            max_row, max_col = self.connection.execute(
+                'SELECT COALESCE(MAX(row), 0), COALESCE(MAX(col), 0) FROM cells WHERE sheet = ?', (sheet,)).fetchone()
+        return max_row, max_col
+
+
+class LocalRequest:
+    def __init__(self, service: 'LocalSheetsService', operation: str, handler, *args):
+        self.service = service
+        self.operation = operation
+        self.handler = handler
+        self.args = args
+
+    def execute(self, num_retries: int = 0) -> Dict[str, Any]:
+        self.service.simulate_call(self.operation)
+        return self.handler(*self.args)
+
+
+class LocalValuesResource:
+    def __init__(self, service: 'LocalSheetsService'):
+        self.service = service
+
+    def batchGet(self, spreadsheetId: str, ranges: List[str], majorDimension: str = 'ROWS',
+                 valueRenderOption: str = 'FORMATTED_VALUE', **_) -> LocalRequest:
+        return LocalRequest(self.service, 'read', self.service.batch_get, spreadsheetId, ranges, majorDimension,
+                            valueRenderOption)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict[str, Any]) -> LocalRequest:
+        return LocalRequest(self.service, 'write', self.service.batch_update, spreadsheetId, body)
+
+
+class LocalSpreadsheetsResource:
+    def __init__(self, service: 'LocalSheetsService'):
+        self.service = service
+
+    def values(self) -> LocalValuesResource:
+        return LocalValuesResource(self.service)
+
+    def get(self, spreadsheetId: str, **_) -> LocalRequest:
+        return LocalRequest(self.service, 'read', self.service.get_spreadsheet, spreadsheetId)
+
+
+class LocalSheetsService:
+    _shared_memory_store = None
+    _store_lock = threading.Lock()
+
+    def __init__(self, store, latency_ms: float = SHEETS_LOCAL_LATENCY_MS, error_rate: float = SHEETS_LOCAL_ERROR_RATE,
+                 requests_per_minute: int = SHEETS_LOCAL_REQUESTS_PER_MINUTE):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.lock = threading.Lock()
+        self.calls: Dict[str, deque] = {'read': deque(), 'write': deque()}
+
+    @staticmethod
+    def create(backend: str, seed_file: str = SHEETS_LOCAL_SEED_FILE) -> 'LocalSheetsService':
+        with LocalSheetsService._store_lock:
+            if backend == SheetsBackend.SQLITE.value:
+                service = LocalSheetsService(SqliteSheetStore())
+            else:
+                if LocalSheetsService._shared_memory_store is None:
+                    LocalSheetsService._shared_memory_store = MemorySheetStore()
+                service = LocalSheetsService(LocalSheetsService._shared_memory_store)
+            service.seed_from_csv(LABELS_SHEET_TITLE, seed_file)
+        return service
+
+    def spreadsheets(self) -> LocalSpreadsheetsResource:
+        return LocalSpreadsheetsResource(self)
+
+    def load_rows(self, sheet: str, rows: List[List[Any]], start_row: int = 1):
+        cells = {(start_row + row_index, col_index + 1): str(value)
+                 for row_index, row in enumerate(rows) for col_index, value in enumerate(row) if value is not None}
+        self.store.write(sheet, cells)
+
+    def seed_from_csv(self, sheet: str, seed_file: str):
+        if sheet in self.store.get_sheet_names():
+            return
+        if not seed_file or not os.path.exists(seed_file):
+            AppLogger.get_logger().warning(f'Local sheet {sheet} is empty and seed file {seed_file} does not exist, '
+                                           f'export the sheet as CSV there to start from its content')
+            return
+        with open(seed_file, newline='', encoding='utf-8') as file:
+            self.load_rows(sheet, list(csv.reader(file)))
+
+    def simulate_call(self, operation: str):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.requests_per_minute:
+            with self.lock:
+                now = time.monotonic()
+                calls = self.calls[operation]
+                while calls and now - calls[0] >= 60:
+                    calls.popleft()
+                if len(calls) >= self.requests_per_minute:
+                    self._raise_http_error(StatusCode.TOO_MANY_REQUESTS.value,
+                                           f'Quota exceeded for {operation} requests per minute')
+                calls.append(now)
+        if self.error_rate and random.random() < self.error_rate:
+            self._raise_http_error(StatusCode.SERVICE_UNAVAILABLE.value, 'The service is currently unavailable')
+
+    def get_spreadsheet(self, spreadsheet_id: str) -> Dict[str, Any]:
+        sheets = []
+        for index, sheet in enumerate(self.store.get_sheet_names()):
+            max_row, max_col = self.store.get_bounds(sheet)
+            sheets.append({'properties': {'sheetId': index, 'title': sheet, 'index': index,
+                                          'gridProperties': {'rowCount': max_row, 'columnCount': max_col}}})
+        return {'spreadsheetId': spreadsheet_id, 'sheets': sheets}
+
+    def batch_get(self, spreadsheet_id: str, ranges: List[str], major_dimension: str,
+                  value_render_option: str = 'FORMATTED_VALUE') -> Dict[str, Any]:
+        return {
+            'spreadsheetId': spreadsheet_id,
+            'valueRanges': [self._get_value_range(a1_range, major_dimension, value_render_option)
+                            for a1_range in ranges]
+        }
+
+    def batch_update(self, spreadsheet_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        responses = []
+        for data in body.get('data', []):
+            sheet, start_col, start_row, _, _ = self._parse_range(data['range'])
+            values = data.get('values', [])
+            if data.get('majorDimension') == 'COLUMNS':
+                values = [list(row) for row in zip(*values)]
+            cells = {(start_row + row_index, start_col + col_index): self._to_cell_value(value)
+                     for row_index, row in enumerate(values) for col_index, value in enumerate(row)
+                     if value is not None}
+            self.store.write(sheet, cells)
+            responses.append({
+                'spreadsheetId': spreadsheet_id,
+                'updatedRange': data['range'],
+                'updatedRows': len({row for row, _ in cells}),
+                'updatedColumns': len({col for _, col in cells}),
+                'updatedCells': len(cells)
+            })
+        return {
+            'spreadsheetId': spreadsheet_id,
+            'totalUpdatedRows': sum(response['updatedRows'] for response in responses),
+            'totalUpdatedColumns': sum(response['updatedColumns'] for response in responses),
+            'totalUpdatedCells': sum(response['updatedCells'] for response in responses),
+            'totalUpdatedSheets': len({self._parse_range(data['range'])[0] for data in body.get('data', [])}),
+            'responses': responses
+        }
+
+    def _get_value_range(self, a1_range: str, major_dimension: str, value_render_option: str) -> Dict[str, Any]:
+        sheet, start_col, start_row, end_col, end_row = self._parse_range(a1_range)
+        max_row, max_col = self.store.get_bounds(sheet)
+        start_col, start_row = start_col or 1, start_row or 1
+        end_col, end_row = end_col or max_col, end_row or max_row
+        cells = self.store.read(sheet, start_col, start_row, end_col, end_row)
+        if value_render_option == 'UNFORMATTED_VALUE':
+            cells = {key: self._to_unformatted_value(value) for key, value in cells.items()}
+        value_range = {
+            'range': f'{sheet}!{index_to_column(start_col)}{start_row}:'
+                     f'{index_to_column(max(end_col, start_col))}{max(end_row, start_row)}',
+            'majorDimension': major_dimension
+        }
+        values = self._build_values(cells, start_col, start_row, end_col, end_row, major_dimension)
+        if values:
+            value_range['values'] = values
+        return value_range
+
+    def _parse_range(self, a1_range: str) -> tuple:
+        sheet, start_col, start_row, end_col, end_row = parse_a1_range(a1_range)
+        return sheet or self.store.get_first_sheet(), start_col, start_row, end_col, end_row
+
+    @staticmethod
+    def _build_values(cells: Dict[tuple, str], start_col: int, start_row: int, end_col: int, end_row: int,
+                      major_dimension: str) -> List[List[str]]:
+        if major_dimension == 'COLUMNS':
+            outer, inner = range(start_col, end_col + 1), range(start_row, end_row + 1)
+            key = lambda outer_index, inner_index: (inner_index, outer_index)
+        else:
+            outer, inner = range(start_row, end_row + 1), range(start_col, end_col + 1)
+            key = lambda outer_index, inner_index: (outer_index, inner_index)
+        values = []
+        for outer_index in outer:
+            line = [cells.get(key(outer_index, inner_index), '') for inner_index in inner]
+            while line and line[-1] == '':
+                line.pop()
+            values.append(line)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    @staticmethod
+    def _to_cell_value(value: Any) -> str:
+        if isinstance(value, bool):
+            return 'TRUE' if value else 'FALSE'
+        return str(value)
+
+    @staticmethod
+    def _to_unformatted_value(value: str) -> Any:
+        typed_value = to_typed_cell_value(value)
+        if isinstance(typed_value, float) and typed_value.is_integer():
+            return int(typed_value)
+        return typed_value
+
+    @staticmethod
+    def _raise_http_error(status: int, message: str):
+        raise HttpError(httplib2.Response({'status': status}), f'{{"error": {{"message": "{message}"}}}}'.encode())
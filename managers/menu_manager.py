@@ -1,9 +1,10 @@
 import time
 
-from constants import MENU_CHOICE_1, MENU_CHOICE_2, EXIT_KEY, MENU_CHOICE_3
+from constants import MENU_CHOICE_1, MENU_CHOICE_2, EXIT_KEY, MENU_CHOICE_3, CACHE_ENABLED
 from enums.menu_action import MenuAction
 from loggers import AppLogger, LabelProcessingLog
 from processors import LabelProcessor, TopProcessor
+from scrappers import HttpClient, RateLimiter, ResponseCache, RequestsHelper
 
 
 class MenuManager:
@@ -57,6 +58,7 @@ class MenuManager:
                 self._handle_logs(labels_processor)
             else:
                 self.logger.warning('No labels were processed successfully or failed.')
+            self._close_http_client()
         self.logger.info('###END LABELS PROCESSING###')
 
     def _process_top100(self):
@@ -67,8 +69,19 @@ class MenuManager:
         except Exception as e:
             self.logger.error(f'An error occurred while processing the top 100: {e}')
         finally:
+            self._close_http_client()
             self.logger.info('###END TOP 100 PROCESSING###')
 
+    def _close_http_client(self):
+        rates = RateLimiter.current_rates()
+        if rates:
+            self.logger.info(f'Current request rates per host (req/s): {rates}')
+        if CACHE_ENABLED:
+            self.logger.info(f'HTTP cache stats: {ResponseCache.get_cache().stats()}')
+        self.logger.info(f'Streaming fetch stats: {RequestsHelper.streaming_stats()}')
+        self.logger.info(f'Request coalescing stats: {RequestsHelper.single_flight_stats()}')
+        HttpClient.close()
+
     def _handle_logs(self, processor):
         if len(processor.labels_in_success) > 0 or len(processor.labels_in_failure) > 0:
             self.logger.info('Writing logs')
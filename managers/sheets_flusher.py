@@ -0,0 +1,91 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Callable, List, Dict, Any
+
+from constants import SHEETS_FLUSH_BATCH_SIZE, SHEETS_FLUSH_INTERVAL_SECONDS, SHEETS_FLUSH_QUEUE_SIZE
+from loggers import AppLogger
+
+STOP = object()
+
+
+class SheetsFlusher:
+    def __init__(self, sheets_manager, prepare_updates: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                 batch_size: int = SHEETS_FLUSH_BATCH_SIZE, interval: float = SHEETS_FLUSH_INTERVAL_SECONDS,
+                 queue_size: int = SHEETS_FLUSH_QUEUE_SIZE):
+        self.logger = AppLogger.get_logger()
+        self.sheets_manager = sheets_manager
+        self.prepare_updates = prepare_updates
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.failed_items: List[Dict[str, Any]] = []
+        self.stats = {'flushes': 0, 'rows_written': 0, 'rows_failed': 0}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='sheets-flusher', daemon=True)
+        self.thread.start()
+
+    def submit(self, item: Dict[str, Any]):
+        self.queue.put(item)
+
+    async def submit_async(self, item: Dict[str, Any]):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.to_thread(self.queue.put, item)
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.queue.put(STOP)
+        self.thread.join()
+        self.thread = None
+        if self.failed_items:
+            self.logger.info(f'Retrying {len(self.failed_items)} rows that failed to flush')
+            failed_items, self.failed_items = self.failed_items, []
+            self.stats['rows_failed'] -= len(failed_items)
+            self._flush(failed_items)
+        self.logger.info(f'Sheets flusher stats: {self.stats}')
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is STOP:
+                    self._flush(batch)
+                    return
+                batch.append(item)
+            except queue.Empty:
+                pass
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.interval
+
+    def _flush(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        try:
+            success = self.sheets_manager.batch_update_in_chunks(self.prepare_updates(batch))
+        except Exception as e:
+            self.logger.error(f'Error while flushing {len(batch)} rows: {e}')
+            success = False
+        self.stats['flushes'] += 1
+        if success:
+            self.stats['rows_written'] += len(batch)
+        else:
+            self.logger.error(f'Failed to flush {len(batch)} rows')
+            self.stats['rows_failed'] += len(batch)
+            self.failed_items.extend(batch)
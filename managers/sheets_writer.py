@@ -0,0 +1,134 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Tuple
+
+from googleapiclient.errors import HttpError
+
+from constants import SHEETS_WRITE_THREADS, SHEETS_WRITE_REQUESTS_PER_MINUTE, SHEETS_CHUNK_MAX_BYTES, \
+    SHEETS_CHUNK_MAX_CELLS, SHEETS_CHUNK_MAX_RANGES, SHEETS_WRITE_MAX_ATTEMPTS, SHEETS_BACKOFF_BASE_SECONDS, \
+    SHEETS_BACKOFF_MAX_SECONDS
+from enums import StatusCode
+from loggers import AppLogger
+from scrappers import HostRateLimiter, RateLimiter
+from utils.utils import parse_a1_range, index_to_column
+
+
+class SheetsWriter:
+    def __init__(self, service_factory: Callable[[], Any], spreadsheet_id: str, max_workers: int = SHEETS_WRITE_THREADS,
+                 requests_per_minute: int = SHEETS_WRITE_REQUESTS_PER_MINUTE):
+        self.logger = AppLogger.get_logger()
+        self.service_factory = service_factory
+        self.spreadsheet_id = spreadsheet_id
+        self.max_workers = max_workers
+        rate = requests_per_minute / 60
+        self.limiter = HostRateLimiter('SHEETS_WRITE', rate=rate, min_rate=rate / 8, max_rate=rate,
+                                       burst=max_workers)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sheets-writer')
+        self.last_write_stats: Dict[str, Any] = {}
+
+    def write(self, updates: List[Dict[str, Any]],
+              max_ranges: int = SHEETS_CHUNK_MAX_RANGES) -> Tuple[bool, List[Dict[str, Any]]]:
+        chunks = self.build_chunks(updates, max_ranges)
+        if not chunks:
+            return True, []
+        started_at = time.monotonic()
+        results = list(self.executor.map(self.write_chunk, chunks))
+        elapsed = max(time.monotonic() - started_at, 1e-6)
+        failed_chunks = results.count(False)
+        cells = sum(self._count_cells(update) for update in updates)
+        payload_bytes = sum(self._estimate_bytes(update) for update in updates)
+        self.last_write_stats = {
+            'chunks': len(chunks),
+            'failed_chunks': failed_chunks,
+            'cells': cells,
+            'bytes': payload_bytes,
+            'seconds': round(elapsed, 2),
+            'cells_per_second': round(cells / elapsed)
+        }
+        self.logger.info(f'Sheets write throughput: {self.last_write_stats}')
+        written = [update for chunk, success in zip(chunks, results) if success for update in chunk]
+        return failed_chunks == 0, written
+
+    def write_chunk(self, chunk: List[Dict[str, Any]]) -> bool:
+        body = {
+            'valueInputOption': 'USER_ENTERED',
+            'data': chunk
+        }
+        for attempt in range(SHEETS_WRITE_MAX_ATTEMPTS):
+            while (wait := self.limiter.try_acquire()) > 0:
+                time.sleep(wait)
+            try:
+                result = self.service_factory().spreadsheets().values().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id, body=body).execute()
+                self.limiter.on_success()
+                self.logger.info(f"Batch update completed. {result.get('totalUpdatedCells')} cells updated.")
+                return True
+            except HttpError as e:
+                status = e.resp.status
+                if status != StatusCode.TOO_MANY_REQUESTS.value and status < 500:
+                    self.logger.error(f'HTTP error occurred during batch update, not retrying: {e}')
+                    return False
+                self.limiter.on_throttle(RateLimiter.parse_retry_after(e.resp.get('retry-after')))
+                self.logger.warning(f'HTTP error occurred during batch update '
+                                    f'(attempt {attempt + 1}/{SHEETS_WRITE_MAX_ATTEMPTS}): {e}')
+            except Exception as e:
+                self.logger.warning(f'Unexpected error during batch update '
+                                    f'(attempt {attempt + 1}/{SHEETS_WRITE_MAX_ATTEMPTS}): {e}')
+            if attempt < SHEETS_WRITE_MAX_ATTEMPTS - 1:
+                time.sleep(self.get_backoff(attempt))
+        self.logger.error(f'Giving up on batch update chunk of {len(chunk)} ranges')
+        return False
+
+    def build_chunks(self, updates: List[Dict[str, Any]],
+                     max_ranges: int = SHEETS_CHUNK_MAX_RANGES) -> List[List[Dict[str, Any]]]:
+        chunks = []
+        chunk, chunk_bytes, chunk_cells = [], 0, 0
+        for update in (piece for update in updates for piece in self._split_update(update)):
+            update_bytes = self._estimate_bytes(update)
+            update_cells = self._count_cells(update)
+            if chunk and (len(chunk) >= max_ranges or chunk_bytes + update_bytes > SHEETS_CHUNK_MAX_BYTES
+                          or chunk_cells + update_cells > SHEETS_CHUNK_MAX_CELLS):
+                chunks.append(chunk)
+                chunk, chunk_bytes, chunk_cells = [], 0, 0
+            chunk.append(update)
+            chunk_bytes += update_bytes
+            chunk_cells += update_cells
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    @staticmethod
+    def _split_update(update: Dict[str, Any]) -> List[Dict[str, Any]]:
+        values = update.get('values', [])
+        width = max((len(row) for row in values), default=0)
+        if len(values) <= 1 or (width * len(values) <= SHEETS_CHUNK_MAX_CELLS
+                                and SheetsWriter._estimate_bytes(update) <= SHEETS_CHUNK_MAX_BYTES):
+            return [update]
+        sheet, start_col, start_row, end_col, _ = parse_a1_range(update['range'])
+        bytes_per_row = SheetsWriter._estimate_bytes(update) / len(values)
+        rows_per_piece = max(1, min(SHEETS_CHUNK_MAX_CELLS // width, int(SHEETS_CHUNK_MAX_BYTES // bytes_per_row)))
+        prefix = f'{sheet}!' if sheet else ''
+        pieces = []
+        for offset in range(0, len(values), rows_per_piece):
+            piece_values = values[offset:offset + rows_per_piece]
+            first_row = start_row + offset
+            last_row = first_row + len(piece_values) - 1
+            pieces.append({**update,
+                           'range': f'{prefix}{index_to_column(start_col)}{first_row}:'
+                                    f'{index_to_column(end_col)}{last_row}',
+                           'values': piece_values})
+        return pieces
+
+    @staticmethod
+    def _estimate_bytes(update: Dict[str, Any]) -> int:
+        return len(json.dumps(update, separators=(',', ':'), default=str).encode())
+
+    @staticmethod
+    def _count_cells(update: Dict[str, Any]) -> int:
+        return sum(len(row) for row in update.get('values', []))
+
+    @staticmethod
+    def get_backoff(attempt: int) -> float:
+        return min(SHEETS_BACKOFF_MAX_SECONDS, SHEETS_BACKOFF_BASE_SECONDS * 2 ** attempt) + random.uniform(0, 1)
@@ -1,109 +1,369 @@
-import json
-from typing import Optional, List, Dict, Any
+import asyncio
+import threading
+import time
+from typing import Optional, List, Dict, Any, Callable
+from urllib.parse import quote, urlsplit, parse_qs
 
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
-from playwright.sync_api import sync_playwright
+import requests
 
-from constants import SONGSTATS_URL, SONGSTATS_API_URL, \
-    MAX_RETRIES
-from enums import TypeLink
+from playwright.async_api import Page as AsyncPage, Response as AsyncResponse
+from playwright.sync_api import Page, Response, TimeoutError as PlaywrightTimeoutError
+
+from constants import SONGSTATS_URL, SONGSTATS_API_URL, SONGSTATS_SEARCH_MODE, REQUEST_TIMEOUT, \
+    SONGSTATS_LABEL_DEADLINE_MS, SONGSTATS_COUNTRY_SELECTOR, SONGSTATS_SEARCH_TIMEOUT_MS, SONGSTATS_EXTRACTION_MODE, \
+    SONGSTATS_PAYLOAD_TIMEOUT_MS, SONGSTATS_PAYLOAD_POLL_MS, SONGSTATS_READY_POLL_MS, SONGSTATS_READY_STABLE_POLLS, \
+    SONGSTATS_LABEL_HEADER_SELECTOR, SONGSTATS_API_LIMITER
+from enums import TypeLink, SongstatsSearchMode, StatusCode, SongstatsExtractionMode
 from loggers import AppLogger
-from scrappers import PlaywrightScrapper
-from scrappers.playwright_scrapper import RequestInterceptor
+from scrappers import BrowserPool, AsyncBrowserPool, HttpClient, SongstatsSession, SongstatsPayloadExtractor, \
+    RateLimiter, HostRateLimiter
+
+LABEL_READY_SCRIPT = '''([headerSelector, countrySelector, linkSelector, stablePolls]) => {
+    const isVisible = (element) => element.getClientRects().length > 0;
+    const hasHeader = [...document.querySelectorAll(headerSelector)].some(isVisible);
+    const hasCountry = [...document.querySelectorAll(countrySelector)].some(isVisible);
+    const linkCount = [...document.querySelectorAll(linkSelector)].filter(isVisible).length;
+    const state = window.__labelReadyState || (window.__labelReadyState = {linkCount: -1, stablePolls: 0});
+    state.stablePolls = linkCount === state.linkCount ? state.stablePolls + 1 : 0;
+    state.linkCount = linkCount;
+    return (hasHeader || hasCountry || linkCount > 0) && state.stablePolls >= stablePolls;
+}'''
+
+LABEL_HARVEST_SCRIPT = '''([countrySelector, linkPatterns]) => {
+    const isVisible = (element) => element.getClientRects().length > 0;
+    const country = [...document.querySelectorAll(countrySelector)].find(isVisible);
+    const links = {};
+    for (const [name, pattern] of Object.entries(linkPatterns)) {
+        const anchors = [...document.querySelectorAll(`a[href*="${pattern}"]`)];
+        const anchor = anchors.find(isVisible);
+        if (anchor) {
+            links[name] = anchor.getAttribute('href');
+        }
+    }
+    return {country: country ? country.innerText : '', links};
+}'''
 
 
 class SongstatsManager:
-    def __init__(self):
+    def __init__(self, browser_pool: BrowserPool = None, search_mode: str = SONGSTATS_SEARCH_MODE,
+                 extraction_mode: str = SONGSTATS_EXTRACTION_MODE):
         self.logger = AppLogger().get_logger()
-        self.crawler = PlaywrightScrapper()
+        self.browser_pool = browser_pool or BrowserPool()
+        self.search_mode = search_mode
+        self.extraction_mode = extraction_mode
+        self.songstats_session = SongstatsSession.get_session()
+        self.search_latencies: List[float] = []
+        self.search_timeouts = 0
+        self.extraction_stats = {'network': 0, 'dom': 0}
+        self.stats_lock = threading.Lock()
+
+    def get_matching_labels(self, label_name: str) -> Optional[List[Dict[str, str]]]:
+        if self.search_mode == SongstatsSearchMode.API.value:
+            labels = self._search_with_api(label_name)
+            if labels is not None:
+                return labels
+        return self._search_with_browser(label_name)
+
+    def _search_with_api(self, label_name: str) -> Optional[List[Dict[str, str]]]:
+        if not self.songstats_session.can_use_api():
+            return None
+        limiter = RateLimiter.get_limiter(SONGSTATS_API_LIMITER)
+        try:
+            while (wait := limiter.try_acquire()) > 0:
+                time.sleep(wait)
+            response = HttpClient.get_session().get(f'{SONGSTATS_API_URL}{quote(label_name)}', timeout=REQUEST_TIMEOUT,
+                                                    **self.songstats_session.get_request_kwargs())
+            self.logger.info(f'Songstats API search for {label_name} with status: {response.status_code}')
+            if response.status_code == StatusCode.SUCCESS.value:
+                return self._read_api_labels(response, limiter)
+            if response.status_code == StatusCode.TOO_MANY_REQUESTS.value:
+                limiter.on_throttle(RateLimiter.parse_retry_after(response.headers.get('Retry-After')))
+            if response.status_code in (StatusCode.UNAUTHORIZED.value, StatusCode.FORBIDDEN.value):
+                self.songstats_session.reject()
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self.logger.warning(f'Songstats API search failed for {label_name}, falling back to browser: {e}')
+        return None
+
+    def _read_api_labels(self, response: requests.Response, limiter: HostRateLimiter) -> Optional[List[Dict[str, str]]]:
+        try:
+            data = response.json()
+        except ValueError:
+            self.logger.warning('Songstats API returned a non JSON response, dropping the API session')
+            self.songstats_session.reject()
+            return None
+        limiter.on_success()
+        return self.filter_songstats_labels(data)
 
-    def get_matching_labels(self, label_name: str) -> List[Dict[str, str]]:
-        interceptor = RequestInterceptor(SONGSTATS_API_URL)
-        with sync_playwright() as p:
-            page = self.crawler.init_playwright_page(p)
-            page.on('request', interceptor)
+    def _search_with_browser(self, label_name: str) -> Optional[List[Dict[str, str]]]:
+        with self.browser_pool.page() as page:
             try:
                 page.goto(SONGSTATS_URL)
                 search_input = page.wait_for_selector('#artistLabelSearchBarInput', state='visible')
-                search_input.fill(label_name)
-                page.wait_for_timeout(300)
-                for request in interceptor.requests:
-                    response = request.response()
-                    if response:
-                        return self.filter_songstats_labels(json.loads(response.text()))
-                return []
+                started_at = time.monotonic()
+                with page.expect_response(self._is_search_response(label_name),
+                                          timeout=SONGSTATS_SEARCH_TIMEOUT_MS) as response_info:
+                    search_input.fill(label_name)
+                response = response_info.value
+                self._record_search_latency(time.monotonic() - started_at)
+                self.songstats_session.store_credentials(response.request.all_headers(), page.context.cookies())
+                return self.filter_songstats_labels(response.json())
+            except PlaywrightTimeoutError:
+                self._record_search_timeout(label_name)
+                return None
             except Exception as e:
                 self.logger.error(f'An error occurred: {e}')
-                return []
-            finally:
-                self.crawler.close_connection()
+                return None
+
+    def get_search_stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            latencies = sorted(self.search_latencies)
+            timeouts = self.search_timeouts
+        if not latencies:
+            return {'searches': 0, 'timeouts': timeouts}
+        return {
+            'searches': len(latencies),
+            'timeouts': timeouts,
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000),
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000),
+            'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000),
+            'max_ms': round(latencies[-1] * 1000)
+        }
+
+    def _record_search_latency(self, latency: float):
+        with self.stats_lock:
+            self.search_latencies.append(latency)
+
+    def _record_search_timeout(self, label_name: str):
+        self.logger.warning(f'Songstats search response not received within {SONGSTATS_SEARCH_TIMEOUT_MS} ms '
+                            f'for {label_name}')
+        with self.stats_lock:
+            self.search_timeouts += 1
+
+    @staticmethod
+    def _is_search_response(label_name: str) -> Callable[[Response], bool]:
+        expected_query = label_name.strip().lower()
+
+        def predicate(response: Response) -> bool:
+            if not response.url.startswith(SONGSTATS_API_URL):
+                return False
+            query = parse_qs(urlsplit(response.url).query).get('q', [''])[0]
+            return query.strip().lower() == expected_query
+
+        return predicate
 
     def get_label_info(self, label_name: str, label_info: Dict[str, str]) -> Dict[str, str | List[
         Dict[str, str]]] | None:
         label_url = self.build_songstats_url(label_info)
-        with sync_playwright() as p:
-            page = self.crawler.init_playwright_page(p)
+        with self.browser_pool.page() as page:
             try:
-                return self._perform_scraping_with_label_url(page, label_url, label_name)
+                return self._perform_scraping_with_label_url(page, label_url, label_name, label_info)
             except Exception as e:
                 self.logger.error(f'An error occurred: {e}')
                 return None
-            finally:
-                self.crawler.close_connection()
 
-    def _perform_scraping_with_label_url(self, page: Page, label_url: str, label_name: str) -> Dict[str, Any]:
-        page.goto(label_url)
+    def _perform_scraping_with_label_url(self, page: Page, label_url: str, label_name: str,
+                                         label_info: Dict[str, Any]) -> Dict[str, Any]:
+        deadline = time.monotonic() + SONGSTATS_LABEL_DEADLINE_MS / 1000
+        if self.extraction_mode == SongstatsExtractionMode.NETWORK.value:
+            harvest = self._harvest_from_network(page, label_url, label_info, deadline)
+            if harvest and harvest['links']:
+                self._increment_extraction('network')
+                return self._build_label_info(harvest, label_url, label_name)
+            self.logger.info(f'No label links captured for {label_name}, falling back to DOM scraping')
+        else:
+            harvest = None
+            page.goto(label_url, timeout=SONGSTATS_LABEL_DEADLINE_MS)
+        self._increment_extraction('dom')
+        dom_harvest = self._merge_harvests(self._harvest_from_dom(page, label_name, deadline), harvest)
+        return self._build_label_info(dom_harvest, label_url, label_name)
+
+    def _harvest_from_network(self, page: Page, label_url: str, label_info: Dict[str, Any],
+                              deadline: float) -> Optional[Dict[str, Any]]:
+        responses: List[Response] = []
+        on_response = responses.append
+        harvest = SongstatsPayloadExtractor.new_harvest(label_info)
+        payload_deadline = min(deadline, time.monotonic() + SONGSTATS_PAYLOAD_TIMEOUT_MS / 1000)
+        page.on('response', on_response)
+        try:
+            page.goto(label_url, wait_until='commit', timeout=SONGSTATS_LABEL_DEADLINE_MS)
+            while True:
+                while responses:
+                    self._merge_response(responses.pop(0), harvest)
+                if SongstatsPayloadExtractor.is_complete(harvest) or time.monotonic() >= payload_deadline:
+                    break
+                try:
+                    page.wait_for_event('response', timeout=min(SONGSTATS_PAYLOAD_POLL_MS,
+                                                                self._get_remaining_ms(payload_deadline)))
+                except PlaywrightTimeoutError:
+                    pass
+        finally:
+            page.remove_listener('response', on_response)
+        return harvest if harvest['matched'] else None
+
+    def _merge_response(self, response: Response, harvest: Dict[str, Any]):
+        if not response.ok or not SongstatsPayloadExtractor.is_label_payload(
+                response.url, response.request.resource_type, response.headers.get('content-type', '')):
+            return
+        try:
+            SongstatsPayloadExtractor.merge_payload(response.json(), harvest)
+        except Exception as e:
+            self.logger.debug(f'Could not read payload from {response.url}: {e}')
+
+    def _harvest_from_dom(self, page: Page, label_name: str, deadline: float) -> Dict[str, Any]:
+        try:
+            page.wait_for_function(LABEL_READY_SCRIPT, arg=self._get_ready_args(), polling=SONGSTATS_READY_POLL_MS,
+                                   timeout=self._get_remaining_ms(deadline))
+        except PlaywrightTimeoutError:
+            self.logger.info(f'Label page not ready before deadline for {label_name}, harvesting what is rendered')
+        return page.evaluate(LABEL_HARVEST_SCRIPT, self._get_harvest_args())
+
+    def get_extraction_stats(self) -> Dict[str, int]:
+        with self.stats_lock:
+            return dict(self.extraction_stats)
+
+    def _increment_extraction(self, source: str):
+        with self.stats_lock:
+            self.extraction_stats[source] += 1
+
+    def _build_label_info(self, harvest: Dict[str, Any], label_url: str, label_name: str) -> Dict[str, Any]:
+        if not harvest['country']:
+            self.logger.info(f'country not found for {label_name}')
         return {
             'name': label_name,
-            'country': self._scrap_label_country(page, label_name),
+            'country': harvest['country'],
             'url': label_url,
-            'links': self._scrap_label_links(page, label_name)
+            'links': harvest['links']
         }
 
-    def _scrap_label_country(self, page: Page, label_name: str) -> str:
-        parent_selector = 'div[style*="display: flex; flex-direction: column; align-items: center;"]'
-        country_span_selector = f'{parent_selector} > div:last-child > span'
-        for attempt in range(MAX_RETRIES):
+    @staticmethod
+    def _merge_harvests(dom_harvest: Dict[str, Any], network_harvest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if network_harvest and not dom_harvest['country']:
+            dom_harvest['country'] = network_harvest['country']
+        return dom_harvest
+
+    @staticmethod
+    def _get_links_to_use() -> List[TypeLink]:
+        return [type_link for type_link in TypeLink if type_link != TypeLink.BANDCAMP_URL]
+
+    @staticmethod
+    def _get_ready_args() -> List[Any]:
+        link_selector = ', '.join(f'a[href*="{type_link.value}"]' for type_link in SongstatsManager._get_links_to_use())
+        return [SONGSTATS_LABEL_HEADER_SELECTOR, SONGSTATS_COUNTRY_SELECTOR, link_selector,
+                SONGSTATS_READY_STABLE_POLLS]
+
+    @staticmethod
+    def _get_harvest_args() -> List[Any]:
+        return [SONGSTATS_COUNTRY_SELECTOR,
+                {type_link.name: type_link.value for type_link in SongstatsManager._get_links_to_use()}]
+
+    @staticmethod
+    def _get_remaining_ms(deadline: float) -> float:
+        return max(1.0, (deadline - time.monotonic()) * 1000)
+
+    @staticmethod
+    def filter_songstats_labels(data: Dict[str, Any]) -> List[Dict[str, str]]:
+        return [item for item in data['results'] if item['type'] == 'label']
+
+    @staticmethod
+    def build_songstats_url(label: Dict[str, str]) -> str:
+        return f"{SONGSTATS_URL}{label['routeInfo']['url']}"
+
+
+class AsyncSongstatsManager(SongstatsManager):
+    def __init__(self, browser_pool: AsyncBrowserPool, search_mode: str = SONGSTATS_SEARCH_MODE,
+                 extraction_mode: str = SONGSTATS_EXTRACTION_MODE):
+        super().__init__(browser_pool, search_mode, extraction_mode)
+
+    async def get_matching_labels(self, label_name: str) -> Optional[List[Dict[str, str]]]:
+        if self.search_mode == SongstatsSearchMode.API.value:
+            labels = await asyncio.to_thread(self._search_with_api, label_name)
+            if labels is not None:
+                return labels
+        return await self._search_with_browser_async(label_name)
+
+    async def _search_with_browser_async(self, label_name: str) -> Optional[List[Dict[str, str]]]:
+        async with self.browser_pool.page() as page:
             try:
-                timeout = 600 * (2 ** attempt)
-                page.wait_for_selector(country_span_selector, state='visible', timeout=timeout)
-                country = page.query_selector(country_span_selector)
-                if country:
-                    return country.inner_text()
+                await page.goto(SONGSTATS_URL)
+                search_input = await page.wait_for_selector('#artistLabelSearchBarInput', state='visible')
+                started_at = time.monotonic()
+                async with page.expect_response(self._is_search_response(label_name),
+                                                timeout=SONGSTATS_SEARCH_TIMEOUT_MS) as response_info:
+                    await search_input.fill(label_name)
+                response = await response_info.value
+                self._record_search_latency(time.monotonic() - started_at)
+                self.songstats_session.store_credentials(await response.request.all_headers(),
+                                                         await page.context.cookies())
+                return self.filter_songstats_labels(await response.json())
             except PlaywrightTimeoutError:
-                self.logger.info(f'country not found on attempt {attempt + 1}/{MAX_RETRIES} for {label_name}')
+                self._record_search_timeout(label_name)
+                return None
             except Exception as e:
                 self.logger.error(f'An error occurred: {e}')
-        return ''
-
-    def _scrap_label_links(self, page: Page, label_name: str) -> Dict[str, str]:
-        label_links = {}
-        links_to_use = [type_link for type_link in TypeLink if type_link != TypeLink.BANDCAMP_URL]
-        for type_link in links_to_use:
-            link = self._get_link(page, type_link.value, label_name)
-            if link:
-                label_links[type_link.name] = link
-        return label_links
-
-    def _get_link(self, page: Page, url: str, label_name: str) -> Optional[str]:
-        selector = f'a[href*="{url}"]'
-        for attempt in range(MAX_RETRIES):
+                return None
+
+    async def get_label_info(self, label_name: str, label_info: Dict[str, str]) -> Dict[str, str | List[
+        Dict[str, str]]] | None:
+        label_url = self.build_songstats_url(label_info)
+        async with self.browser_pool.page() as page:
             try:
-                timeout = 600 * (2 ** attempt)
-                page.wait_for_selector(selector, state='visible', timeout=timeout)
-                link = page.query_selector(selector)
-                if link:
-                    return link.get_attribute('href')
-            except PlaywrightTimeoutError:
-                self.logger.info(f'{url} not found on attempt {attempt + 1}/{MAX_RETRIES} for {label_name}')
+                return await self._perform_scraping_with_label_url_async(page, label_url, label_name, label_info)
             except Exception as e:
                 self.logger.error(f'An error occurred: {e}')
-        return None
+                return None
 
-    @staticmethod
-    def filter_songstats_labels(data: Dict[str, Any]) -> List[Dict[str, str]]:
-        return [item for item in data['results'] if item['type'] == 'label']
+    async def _perform_scraping_with_label_url_async(self, page: AsyncPage, label_url: str, label_name: str,
+                                                     label_info: Dict[str, Any]) -> Dict[str, Any]:
+        deadline = time.monotonic() + SONGSTATS_LABEL_DEADLINE_MS / 1000
+        if self.extraction_mode == SongstatsExtractionMode.NETWORK.value:
+            harvest = await self._harvest_from_network_async(page, label_url, label_info, deadline)
+            if harvest and harvest['links']:
+                self._increment_extraction('network')
+                return self._build_label_info(harvest, label_url, label_name)
+            self.logger.info(f'No label links captured for {label_name}, falling back to DOM scraping')
+        else:
+            harvest = None
+            await page.goto(label_url, timeout=SONGSTATS_LABEL_DEADLINE_MS)
+        self._increment_extraction('dom')
+        dom_harvest = self._merge_harvests(await self._harvest_from_dom_async(page, label_name, deadline), harvest)
+        return self._build_label_info(dom_harvest, label_url, label_name)
 
-    @staticmethod
-    def build_songstats_url(label: Dict[str, str]) -> str:
-        return f"{SONGSTATS_URL}{label['routeInfo']['url']}"
+    async def _harvest_from_network_async(self, page: AsyncPage, label_url: str, label_info: Dict[str, Any],
+                                          deadline: float) -> Optional[Dict[str, Any]]:
+        responses: List[AsyncResponse] = []
+        on_response = responses.append
+        harvest = SongstatsPayloadExtractor.new_harvest(label_info)
+        payload_deadline = min(deadline, time.monotonic() + SONGSTATS_PAYLOAD_TIMEOUT_MS / 1000)
+        page.on('response', on_response)
+        try:
+            await page.goto(label_url, wait_until='commit', timeout=SONGSTATS_LABEL_DEADLINE_MS)
+            while True:
+                while responses:
+                    await self._merge_response_async(responses.pop(0), harvest)
+                if SongstatsPayloadExtractor.is_complete(harvest) or time.monotonic() >= payload_deadline:
+                    break
+                try:
+                    await page.wait_for_event('response', timeout=min(SONGSTATS_PAYLOAD_POLL_MS,
+                                                                      self._get_remaining_ms(payload_deadline)))
+                except PlaywrightTimeoutError:
+                    pass
+        finally:
+            page.remove_listener('response', on_response)
+        return harvest if harvest['matched'] else None
+
+    async def _merge_response_async(self, response: AsyncResponse, harvest: Dict[str, Any]):
+        if not response.ok or not SongstatsPayloadExtractor.is_label_payload(
+                response.url, response.request.resource_type, response.headers.get('content-type', '')):
+            return
+        try:
+            SongstatsPayloadExtractor.merge_payload(await response.json(), harvest)
+        except Exception as e:
+            self.logger.debug(f'Could not read payload from {response.url}: {e}')
+
+    async def _harvest_from_dom_async(self, page: AsyncPage, label_name: str, deadline: float) -> Dict[str, Any]:
+        try:
+            await page.wait_for_function(LABEL_READY_SCRIPT, arg=self._get_ready_args(),
+                                         polling=SONGSTATS_READY_POLL_MS, timeout=self._get_remaining_ms(deadline))
+        except PlaywrightTimeoutError:
+            self.logger.info(f'Label page not ready before deadline for {label_name}, harvesting what is rendered')
+        return await page.evaluate(LABEL_HARVEST_SCRIPT, self._get_harvest_args())
@@ -1,29 +1,32 @@
 from enums import TypeLink
 from loggers import AppLogger
-from scrappers import RequestsHelper
+from scrappers import RequestsHelper, AsyncRequestsHelper
 from utils.utils import find_demo_email
 
 
 class SoundcloudManager:
-    def __init__(self):
+    def __init__(self, helper: RequestsHelper = None):
         self.logger = AppLogger().get_logger()
-        self.helper = RequestsHelper()
+        self.helper = helper or RequestsHelper()
 
     def get_soundcloud_info(self, url, label_name):
         try:
             data = self.helper.scrap_with_requests(url, TypeLink.SOUNDCLOUD_URL)
-            user_profile_info = self._get_user_profile_info(data)
-            if user_profile_info:
-                return {
-                    'name': label_name,
-                    'email_demo': find_demo_email(user_profile_info.get('description', '')),
-                    'soundcloud_followers': user_profile_info.get('followers_number', 0)
-                }
-            return None
+            return self._build_soundcloud_info(data, label_name)
         except Exception as e:
             self.logger.error(f'Error getting Soundcloud info for {label_name}: {str(e)}')
             return None
 
+    def _build_soundcloud_info(self, data, label_name):
+        user_profile_info = self._get_user_profile_info(data)
+        if user_profile_info:
+            return {
+                'name': label_name,
+                'email_demo': find_demo_email(user_profile_info.get('description', '')),
+                'soundcloud_followers': user_profile_info.get('followers_number', 0)
+            }
+        return None
+
     def _get_user_profile_info(self, data):
         if not isinstance(data, list):
             self.logger.error('Invalid data format: expected list of dictionaries')
@@ -37,3 +40,16 @@ class SoundcloudManager:
                 }
         self.logger.warning('No user data found in the provided data')
         return None
+
+
+class AsyncSoundcloudManager(SoundcloudManager):
+    def __init__(self, helper: AsyncRequestsHelper):
+        super().__init__(helper)
+
+    async def get_soundcloud_info(self, url, label_name):
+        try:
+            data = await self.helper.scrap_with_requests(url, TypeLink.SOUNDCLOUD_URL)
+            return self._build_soundcloud_info(data, label_name)
+        except Exception as e:
+            self.logger.error(f'Error getting Soundcloud info for {label_name}: {str(e)}')
+            return None
@@ -0,0 +1,4 @@
+from .label_table import LabelRecord, LabelTable
+from .sheet_schema import SONGSTATS_READ_COLUMNS, LINKS_READ_COLUMNS, TOP_100_READ_COLUMNS, LINK_COLUMNS, \
+    SONGSTATS_UPDATE_COLUMNS, LINKS_UPDATE_COLUMNS, VINYLS_UPDATE_COLUMNS, BEATSTATS_UPDATE_COLUMNS, \
+    BEATSTATS_NEW_LABEL_COLUMNS
@@ -0,0 +1,96 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Any
+
+from constants import LABELS_FIRST_ROW
+from enums import LabelColumn
+from utils.utils import to_cell_text
+
+
+class LabelRecord:
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'LabelTable', index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def row(self) -> int:
+        return self.table.start_row + self.index
+
+    @property
+    def name(self) -> str:
+        return self.get(LabelColumn.NAME)
+
+    def get(self, column: LabelColumn, default: str = '') -> str:
+        return self.table.get(self.index, column) or default
+
+    def set(self, column: LabelColumn, value: str):
+        self.table.set(self.index, column, value)
+
+    def __getitem__(self, field: str) -> str:
+        return self.get(LabelColumn[field.upper()])
+
+    def __repr__(self) -> str:
+        return f'LabelRecord(row={self.row}, name={self.name!r})'
+
+
+class LabelTable:
+    def __init__(self, columns: Sequence[LabelColumn], start_row: int = LABELS_FIRST_ROW):
+        self.columns = tuple(columns)
+        self.column_index = {column: index for index, column in enumerate(self.columns)}
+        self.start_row = start_row
+        self.data: List[List[Any]] = [[] for _ in self.columns]
+        self.length = 0
+
+    @staticmethod
+    def from_value_ranges(columns: Sequence[LabelColumn], value_ranges: List[Dict[str, Any]],
+                          start_row: int = LABELS_FIRST_ROW) -> 'LabelTable':
+        table = LabelTable(columns, start_row)
+        for index, value_range in enumerate(value_ranges):
+            values = value_range.get('values', [])
+            table.data[index] = list(values[0]) if values else []
+        table.length = max((len(column_data) for column_data in table.data), default=0)
+        for column_data in table.data:
+            column_data.extend([''] * (table.length - len(column_data)))
+        return table
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[LabelRecord]:
+        return (LabelRecord(self, index) for index in range(self.length))
+
+    def get(self, index: int, column: LabelColumn) -> str:
+        column_index = self.column_index.get(column)
+        return to_cell_text(self.data[column_index][index]) if column_index is not None else ''
+
+    def set(self, index: int, column: LabelColumn, value: Any):
+        column_index = self.column_index.get(column)
+        if column_index is not None:
+            self.data[column_index][index] = value
+
+    def append(self, values: Dict[LabelColumn, str]) -> LabelRecord:
+        for column, column_data in zip(self.columns, self.data):
+            column_data.append(values.get(column, ''))
+        self.length += 1
+        return LabelRecord(self, self.length - 1)
+
+    def get_cell(self, row: int, column: LabelColumn) -> Optional[Any]:
+        index = row - self.start_row
+        if column not in self.column_index or not 0 <= index < self.length:
+            return None
+        return self.data[self.column_index[column]][index]
+
+    def set_cell(self, row: int, column: LabelColumn, value: Any):
+        index = row - self.start_row
+        if 0 <= index < self.length:
+            self.set(index, column, value)
+
+    def get_last_row(self) -> int:
+        return self.start_row + self.length - 1
+
+    def copy(self, columns: Optional[Sequence[LabelColumn]] = None) -> 'LabelTable':
+        columns = self.columns if columns is None else [column for column in columns if column in self.column_index]
+        table = LabelTable(columns, self.start_row)
+        table.data = [list(self.data[self.column_index[column]]) for column in table.columns]
+        table.length = self.length
+        return table
@@ -0,0 +1,17 @@
+from enums import LabelColumn
+
+LINK_COLUMNS = (LabelColumn.BEATPORT_URL, LabelColumn.SOUNDCLOUD_URL, LabelColumn.FACEBOOK_URL,
+                LabelColumn.INSTAGRAM_URL)
+
+SONGSTATS_UPDATE_COLUMNS = (LabelColumn.COUNTRY, LabelColumn.SOUNDCLOUD_URL, LabelColumn.FACEBOOK_URL,
+                            LabelColumn.INSTAGRAM_URL, LabelColumn.BEATPORT_URL, LabelColumn.SONGSTATS_FLAG)
+LINKS_UPDATE_COLUMNS = (LabelColumn.ACTIF, LabelColumn.OUVERT_NOUVEAUX, LabelColumn.EMAIL_DEMO,
+                        LabelColumn.SOUNDCLOUD_FOLLOWERS)
+VINYLS_UPDATE_COLUMNS = (LabelColumn.COUNTRY, LabelColumn.BANDCAMP_URL)
+BEATSTATS_UPDATE_COLUMNS = (LabelColumn.GENRE, LabelColumn.POSITION, LabelColumn.BEATSTATS_FLAG)
+BEATSTATS_NEW_LABEL_COLUMNS = (LabelColumn.NAME, LabelColumn.GENRE, LabelColumn.BEATPORT_URL, LabelColumn.POSITION,
+                               LabelColumn.BEATSTATS_FLAG)
+
+SONGSTATS_READ_COLUMNS = (LabelColumn.NAME,) + SONGSTATS_UPDATE_COLUMNS
+LINKS_READ_COLUMNS = (LabelColumn.NAME,) + LINK_COLUMNS + LINKS_UPDATE_COLUMNS + VINYLS_UPDATE_COLUMNS
+TOP_100_READ_COLUMNS = BEATSTATS_NEW_LABEL_COLUMNS
@@ -1,11 +1,17 @@
+import asyncio
 import threading
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, AsyncIterator, Optional, Sequence
 
-from constants import THREADS_NUMBER, CREDENTIALS_FILE, SPREADSHEET_ID, OUI
-from enums import MenuAction, TypeLink
+from constants import THREADS_NUMBER, CREDENTIALS_FILE, SPREADSHEET_ID, OUI, FETCH_ENGINE, ASYNC_MAX_CONCURRENCY, \
+    SONGSTATS_ENGINE, SHEETS_INCREMENTAL_WRITE_ENABLED
+from enums import MenuAction, TypeLink, FetchEngine, LabelColumn
 from loggers import AppLogger
-from managers import GoogleSheetsManager, SongstatsManager, BeatportManager, SoundcloudManager, BandcampManager
+from managers import GoogleSheetsManager, SongstatsManager, BeatportManager, SoundcloudManager, BandcampManager, \
+    AsyncBeatportManager, AsyncSoundcloudManager, AsyncBandcampManager, AsyncSongstatsManager, SheetsFlusher
+from models import LabelRecord, LabelTable, SONGSTATS_READ_COLUMNS, LINKS_READ_COLUMNS, LINK_COLUMNS, \
+    SONGSTATS_UPDATE_COLUMNS, LINKS_UPDATE_COLUMNS, VINYLS_UPDATE_COLUMNS
+from scrappers import AsyncRequestsHelper, BrowserPool, AsyncBrowserPool
 from utils.utils import find_best_match
 
 
@@ -13,57 +19,98 @@ class LabelProcessor:
     def __init__(self):
         self.logger = AppLogger().get_logger()
         self.sheets_manager = GoogleSheetsManager(CREDENTIALS_FILE, SPREADSHEET_ID)
-        self.filtered_labels_from_sheet: List[Dict[str, Any]] = []
+        self.beatport_manager = BeatportManager()
+        self.soundcloud_manager = SoundcloudManager()
+        self.bandcamp_manager = BandcampManager()
+        self.browser_pool = BrowserPool()
+        self.songstats_manager = SongstatsManager(self.browser_pool)
+        self.async_beatport_manager = None
+        self.async_soundcloud_manager = None
+        self.async_bandcamp_manager = None
+        self.async_songstats_manager = None
+        self.flusher = None
         self.labels_in_success: List[Dict[str, Any]] = []
         self.labels_in_failure: List[Dict[str, str]] = []
         self.labels_info: Dict[int, Dict[str, Any]] = {}
         self.total_labels_to_proceed = 0
         self.labels_lock = threading.Lock()
 
-    def run(self, action: MenuAction):
-        self.filtered_labels_from_sheet = self._build_labels_name_from_sheet(
-            action == MenuAction.PROCESS_SONGSTATS.value)
+    def run(self, action: MenuAction, engine: str = FETCH_ENGINE, songstats_engine: str = SONGSTATS_ENGINE):
+        self.total_labels_to_proceed = 0
+        if SHEETS_INCREMENTAL_WRITE_ENABLED:
+            self.flusher = SheetsFlusher(self.sheets_manager, self._get_prepare_method(action))
+            self.flusher.start()
+        try:
+            self._process_labels(action, engine, songstats_engine)
+        finally:
+            if self.flusher:
+                self.flusher.close()
+                self.flusher = None
 
-        if not self.filtered_labels_from_sheet:
+        if not self.total_labels_to_proceed:
             self.logger.warning('No labels to process. Exiting.')
             return
-
-        self.total_labels_to_proceed = len(self.filtered_labels_from_sheet)
         self.logger.info(f'Total labels to process: {self.total_labels_to_proceed}')
 
-        process_method = self._get_process_method(action)
-
-        with ThreadPoolExecutor(max_workers=THREADS_NUMBER) as executor:
-            list(executor.map(process_method, self.filtered_labels_from_sheet))
-
-        if self.labels_in_success:
+        if self.labels_in_success and not SHEETS_INCREMENTAL_WRITE_ENABLED:
             updates = self._prepare_batch_for_updates(action)
             success = self.sheets_manager.batch_update_in_chunks(updates)
             if not success:
                 self.logger.error('Failed to perform batch update')
 
-    def _build_labels_name_from_sheet(self, is_songstats: bool) -> List[Dict[str, Any]]:
+    def _process_labels(self, action: MenuAction, engine: str, songstats_engine: str):
+        if action == MenuAction.PROCESS_SONGSTATS.value and songstats_engine == FetchEngine.ASYNCIO.value:
+            asyncio.run(self._run_songstats_async())
+        elif engine == FetchEngine.ASYNCIO.value and action != MenuAction.PROCESS_SONGSTATS.value:
+            asyncio.run(self._run_async(action))
+        else:
+            process_method = self._get_process_method(action)
+            is_songstats = action == MenuAction.PROCESS_SONGSTATS.value
+            labels = self._iter_labels_from_sheet(is_songstats, self._get_update_columns(action))
+            if is_songstats:
+                self.browser_pool.map(process_method, labels, THREADS_NUMBER)
+                self.logger.info(f'Browser pool stats: {self.browser_pool.get_stats()}')
+                self.logger.info(f'Songstats search stats: {self.songstats_manager.get_search_stats()}')
+                self.logger.info(f'Songstats extraction stats: {self.songstats_manager.get_extraction_stats()}')
+            else:
+                with ThreadPoolExecutor(max_workers=THREADS_NUMBER) as executor:
+                    list(executor.map(process_method, labels))
+
+    def _iter_labels_from_sheet(self, is_songstats: bool, update_columns: Sequence[LabelColumn]) -> Iterator[LabelRecord]:
+        for table in self.sheets_manager.iter_column_blocks(self._get_read_columns(is_songstats),
+                                                            snapshot_columns=update_columns):
+            yield from self._filter_labels(table, is_songstats)
+
+    async def _aiter_labels_from_sheet(self, is_songstats: bool, update_columns: Sequence[LabelColumn]) -> AsyncIterator[LabelRecord]:
+        blocks = self.sheets_manager.iter_column_blocks(self._get_read_columns(is_songstats),
+                                                        snapshot_columns=update_columns)
+        while (table := await asyncio.to_thread(next, blocks, None)) is not None:
+            for label in self._filter_labels(table, is_songstats):
+                yield label
+
+    @staticmethod
+    def _get_read_columns(is_songstats: bool):
+        return SONGSTATS_READ_COLUMNS if is_songstats else LINKS_READ_COLUMNS
+
+    @staticmethod
+    def _get_update_columns(action):
+        match action:
+            case MenuAction.PROCESS_SONGSTATS.value:
+                return SONGSTATS_UPDATE_COLUMNS
+            case MenuAction.PROCESS_LINKS.value:
+                return LINKS_UPDATE_COLUMNS
+            case MenuAction.PROCESS_VINYLS.value:
+                return VINYLS_UPDATE_COLUMNS
+
+    def _filter_labels(self, table: LabelTable, is_songstats: bool) -> List[LabelRecord]:
+        named_labels = (label for label in table if label.name.strip())
         if is_songstats:
-            labels = self.sheets_manager.read_columns('Labels!A2:A,U2:U')
-            return [
-                {'row': row[0], 'name': row[1]}
-                for row in labels
-                if row[2] != OUI
-            ]
+            labels = [label for label in named_labels if label.get(LabelColumn.SONGSTATS_FLAG) != OUI]
         else:
-            labels = self.sheets_manager.read_columns('Labels!A2:A,R2:R,O2:O,P2:P,Q2:Q')
-            return [
-                {
-                    'row': row[0],
-                    'name': row[1],
-                    TypeLink.BEATPORT_URL.name: row[2] if len(row) > 2 and row[2] else None,
-                    TypeLink.SOUNDCLOUD_URL.name: row[3] if len(row) > 3 and row[3] else None,
-                    TypeLink.FACEBOOK_URL.name: row[4] if len(row) > 4 and row[4] else None,
-                    TypeLink.INSTAGRAM_URL.name: row[5] if len(row) > 5 and row[5] else None,
-                }
-                for row in labels
-                if row[2] or row[3] or row[4] or row[5]
-            ]
+            labels = [label for label in named_labels if any(label.get(column) for column in LINK_COLUMNS)]
+        self.total_labels_to_proceed += len(labels)
+        self.logger.info(f'Queued {len(labels)} labels from rows {table.start_row}-{table.get_last_row()}')
+        return labels
 
     def _get_process_method(self, action):
         match action:
@@ -74,25 +121,61 @@ class LabelProcessor:
             case MenuAction.PROCESS_VINYLS.value:
                 return self._process_label_for_vinyls
 
+    def _get_async_process_method(self, action):
+        match action:
+            case MenuAction.PROCESS_LINKS.value:
+                return self._process_label_content_from_links_async
+            case MenuAction.PROCESS_VINYLS.value:
+                return self._process_label_for_vinyls_async
+
+    async def _run_async(self, action):
+        process_method = self._get_async_process_method(action)
+        semaphore = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+
+        async def process_with_limit(label):
+            async with semaphore:
+                await process_method(label)
+
+        async with AsyncRequestsHelper() as helper:
+            self.async_beatport_manager = AsyncBeatportManager(helper)
+            self.async_soundcloud_manager = AsyncSoundcloudManager(helper)
+            self.async_bandcamp_manager = AsyncBandcampManager(helper)
+            tasks = [asyncio.create_task(process_with_limit(label))
+                     async for label in self._aiter_labels_from_sheet(False, self._get_update_columns(action))]
+            await asyncio.gather(*tasks)
+
+    async def _run_songstats_async(self):
+        async with AsyncBrowserPool() as browser_pool:
+            self.async_songstats_manager = AsyncSongstatsManager(browser_pool)
+            tasks = [asyncio.create_task(self._process_label_content_from_songstats_async(label))
+                     async for label in self._aiter_labels_from_sheet(True, SONGSTATS_UPDATE_COLUMNS)]
+            await asyncio.gather(*tasks)
+            self.logger.info(f'Songstats search stats: {self.async_songstats_manager.get_search_stats()}')
+            self.logger.info(f'Songstats extraction stats: {self.async_songstats_manager.get_extraction_stats()}')
+
     def _prepare_batch_for_updates(self, action):
+        return self._get_prepare_method(action)(self.labels_in_success)
+
+    def _get_prepare_method(self, action):
         match action:
             case MenuAction.PROCESS_SONGSTATS.value:
-                return self.sheets_manager.prepare_batch_updates_for_songstats(
-                    self.labels_in_success)
+                return self.sheets_manager.prepare_batch_updates_for_songstats
             case MenuAction.PROCESS_LINKS.value:
-                return self.sheets_manager.prepare_batch_updates_for_links(
-                    self.labels_in_success)
+                return self.sheets_manager.prepare_batch_updates_for_links
             case MenuAction.PROCESS_VINYLS.value:
-                return self.sheets_manager.prepare_batch_updates_for_vinyles(self.labels_in_success)
+                return self.sheets_manager.prepare_batch_updates_for_vinyles
 
-    def _process_label_content_from_songstats(self, label: Dict[str, Any]):
+    def _process_label_content_from_songstats(self, label: LabelRecord):
         try:
             label_name, label_row = self._get_label_info(label)
             if not label_row:
                 return
 
-            songstats_manager = SongstatsManager()
-            labels_info = songstats_manager.get_matching_labels(label_name)
+            labels_info = self.songstats_manager.get_matching_labels(label_name)
+
+            if labels_info is None:
+                self._add_to_failure(label_name, 'Songstats search did not respond')
+                return
 
             if not labels_info:
                 self._add_to_failure(label_name, 'No matching labels found')
@@ -103,21 +186,25 @@ class LabelProcessor:
                 self._add_to_failure(label_name, 'No best match found')
                 return
 
-            label_info = songstats_manager.get_label_info(label_name, best_match)
-            if not label_info:
-                self._add_to_failure(label_name, 'Could not retrieve label info')
-                return
-
-            if not label_info.get('links'):
-                self._add_to_failure(label_name, f'Could not find links for {label_name}')
-            else:
-                self._add_to_label_info(label_row, label_info)
+            label_info = self.songstats_manager.get_label_info(label_name, best_match)
+            if self._handle_songstats_label_info(label_name, label_row, label_info):
                 self._add_label_info_to_success(label_row)
 
         except Exception as e:
             self._handle_exception(label_name, e)
 
-    def _process_label_content_from_links(self, label: Dict[str, Any]):
+    def _handle_songstats_label_info(self, label_name: str, label_row: int, label_info: Dict[str, Any]) -> bool:
+        if not label_info:
+            self._add_to_failure(label_name, 'Could not retrieve label info')
+            return False
+
+        if not label_info.get('links'):
+            self._add_to_failure(label_name, f'Could not find links for {label_name}')
+            return False
+        self._add_to_label_info(label_row, label_info)
+        return True
+
+    def _process_label_content_from_links(self, label: LabelRecord):
         try:
             label_name, label_row = self._get_label_info(label)
             if not label_row:
@@ -127,58 +214,128 @@ class LabelProcessor:
         except Exception as e:
             self._handle_exception(label_name, e)
 
-    def _process_label_for_vinyls(self, label: Dict[str, Any]):
+    def _process_label_for_vinyls(self, label: LabelRecord):
+        try:
+            label_name, label_row = self._get_label_info(label)
+            if not label_row:
+                return
+            labels_info = self.bandcamp_manager.get_bandcamp_info(label_name)
+            if self._handle_bandcamp_results(label_name, label_row, labels_info):
+                self._add_label_info_to_success(label_row)
+        except Exception as e:
+            self._handle_exception(label_name, e)
+
+    def _handle_bandcamp_results(self, label_name: str, label_row: int, labels_info: List[Dict[str, Any]]) -> bool:
+        if not labels_info:
+            self._add_to_failure(label_name, 'No matching labels found')
+            return False
+        best_match = find_best_match(label_name, labels_info, 90)
+        if not best_match:
+            self._add_to_failure(label_name, 'No best match found')
+            return False
+        self._add_to_label_info(label_row, best_match)
+        return True
+
+    async def _process_label_content_from_songstats_async(self, label: LabelRecord):
         try:
             label_name, label_row = self._get_label_info(label)
             if not label_row:
                 return
-            bandcamp_manager = BandcampManager()
-            labels_info = bandcamp_manager.get_bandcamp_info(label_name)
+
+            labels_info = await self.async_songstats_manager.get_matching_labels(label_name)
+
+            if labels_info is None:
+                self._add_to_failure(label_name, 'Songstats search did not respond')
+                return
+
             if not labels_info:
                 self._add_to_failure(label_name, 'No matching labels found')
                 return
-            best_match = find_best_match(label_name, labels_info, 90)
+
+            best_match = find_best_match(label_name, labels_info)
             if not best_match:
                 self._add_to_failure(label_name, 'No best match found')
                 return
-            else:
-                self._add_to_label_info(label_row, best_match)
-                self._add_label_info_to_success(label_row)
+
+            label_info = await self.async_songstats_manager.get_label_info(label_name, best_match)
+            if self._handle_songstats_label_info(label_name, label_row, label_info):
+                await self._add_label_info_to_success_async(label_row)
+
+        except Exception as e:
+            self._handle_exception(label_name, e)
+
+    async def _process_label_content_from_links_async(self, label: LabelRecord):
+        try:
+            label_name, label_row = self._get_label_info(label)
+            if not label_row:
+                return
+            await self._process_label_for_links_async(label, label_name, label_row)
+            await self._add_label_info_to_success_async(label_row)
+        except Exception as e:
+            self._handle_exception(label_name, e)
+
+    async def _process_label_for_vinyls_async(self, label: LabelRecord):
+        try:
+            label_name, label_row = self._get_label_info(label)
+            if not label_row:
+                return
+            labels_info = await self.async_bandcamp_manager.get_bandcamp_info(label_name)
+            if self._handle_bandcamp_results(label_name, label_row, labels_info):
+                await self._add_label_info_to_success_async(label_row)
         except Exception as e:
             self._handle_exception(label_name, e)
 
-    def _get_label_info(self, label: Dict[str, Any]) -> tuple:
-        label_name = label.get('name', 'Unknown')
-        label_row = label.get('row', 'Unknown')
+    def _get_label_info(self, label: LabelRecord) -> tuple:
+        label_name = label.name.strip()
+        label_row = label.row
         self.logger.info(f'Processing label: {label_name} -> in row: {label_row}')
-        if not label_row:
-            self._add_to_failure(label_name, 'Row not found')
+        if not label_name:
+            self._add_to_failure(f'Row {label_row}', 'Label name is empty')
             return label_name, None
         return label_name, label_row
 
-    def _process_label_for_links(self, label: Dict[str, Any], label_name: str, label_row: int):
+    def _process_label_for_links(self, label: LabelRecord, label_name: str, label_row: int):
         processing_type_links = [TypeLink.BEATPORT_URL, TypeLink.SOUNDCLOUD_URL]
         for type_link in processing_type_links:
-            url = label.get(type_link.name)
+            url = label.get(LabelColumn[type_link.name])
             if not url:
                 continue
 
             self.logger.info(f'Processing {type_link.name} for {label_name}')
             match type_link:
                 case TypeLink.BEATPORT_URL:
-                    beatport_manager = BeatportManager()
-                    label_info = beatport_manager.get_beatport_info(url, label_name)
+                    label_info = self.beatport_manager.get_beatport_info(url, label_name)
                 case TypeLink.SOUNDCLOUD_URL:
-                    soundcloud_manager = SoundcloudManager()
-                    label_info = soundcloud_manager.get_soundcloud_info(url, label_name)
+                    label_info = self.soundcloud_manager.get_soundcloud_info(url, label_name)
                 case _:
                     self.logger.warning(f'No manager found for {type_link.name}')
                     continue
 
-            if label_info:
-                self._add_to_label_info(label_row, label_info)
-            else:
-                self._add_to_failure(label_name, f'No {type_link.name} info found')
+            self._handle_link_info(label_name, label_row, type_link, label_info)
+
+    async def _process_label_for_links_async(self, label: LabelRecord, label_name: str, label_row: int):
+        tasks = {}
+        for type_link in [TypeLink.BEATPORT_URL, TypeLink.SOUNDCLOUD_URL]:
+            url = label.get(LabelColumn[type_link.name])
+            if not url:
+                continue
+
+            self.logger.info(f'Processing {type_link.name} for {label_name}')
+            match type_link:
+                case TypeLink.BEATPORT_URL:
+                    tasks[type_link] = self.async_beatport_manager.get_beatport_info(url, label_name)
+                case TypeLink.SOUNDCLOUD_URL:
+                    tasks[type_link] = self.async_soundcloud_manager.get_soundcloud_info(url, label_name)
+
+        results = await asyncio.gather(*tasks.values())
+        for type_link, label_info in zip(tasks.keys(), results):
+            self._handle_link_info(label_name, label_row, type_link, label_info)
+
+    def _handle_link_info(self, label_name: str, label_row: int, type_link: TypeLink, label_info: Dict[str, Any]):
+        if label_info:
+            self._add_to_label_info(label_row, label_info)
+        else:
+            self._add_to_failure(label_name, f'No {type_link.name} info found')
 
     def _add_to_label_info(self, label_row: int, label_info: Dict[str, Any]):
         with self.labels_lock:
@@ -191,10 +348,26 @@ class LabelProcessor:
             self.labels_in_failure.append({'name': label_name, 'reason': reason})
 
     def _add_label_info_to_success(self, label_row: int):
+        success_info = self._pop_label_success(label_row)
+        if success_info and self.flusher:
+            self.flusher.submit(success_info)
+
+    async def _add_label_info_to_success_async(self, label_row: int):
+        success_info = self._pop_label_success(label_row)
+        if success_info and self.flusher:
+            await self.flusher.submit_async(success_info)
+
+    def _pop_label_success(self, label_row: int) -> Optional[Dict[str, Any]]:
         with self.labels_lock:
-            if label_row in self.labels_info:
-                self.labels_in_success.append(self.labels_info[label_row])
-                del self.labels_info[label_row]
+            success_info = self.labels_info.pop(label_row, None)
+            if success_info is None:
+                return None
+            if self.flusher:
+                label_name = {'name': success_info['label']['name']} if 'name' in success_info['label'] else {}
+                self.labels_in_success.append({'row': label_row, 'label': label_name})
+            else:
+                self.labels_in_success.append(success_info)
+        return success_info
 
     def _handle_exception(self, label_name: str, e: Exception):
         self.logger.error(f'Error processing label {label_name}: {str(e)}')
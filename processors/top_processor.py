@@ -1,11 +1,14 @@
+import asyncio
 import math
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
-from constants import THREADS_NUMBER, CREDENTIALS_FILE, SPREADSHEET_ID, OUI
-from enums import BeatstatsGenre, TypeLink
+from constants import THREADS_NUMBER, CREDENTIALS_FILE, SPREADSHEET_ID, OUI, FETCH_ENGINE
+from enums import BeatstatsGenre, TypeLink, FetchEngine, LabelColumn
 from loggers import AppLogger
-from managers import BeatstatsManager, GoogleSheetsManager
+from managers import BeatstatsManager, GoogleSheetsManager, AsyncBeatstatsManager
+from models import LabelRecord, LabelTable, TOP_100_READ_COLUMNS, BEATSTATS_UPDATE_COLUMNS
+from scrappers import AsyncRequestsHelper
 from utils.utils import find_best_match, extract_number
 
 
@@ -15,64 +18,113 @@ class TopProcessor:
         self.sheets_manager = GoogleSheetsManager(CREDENTIALS_FILE, SPREADSHEET_ID)
         self.beatstats_manager = BeatstatsManager()
         self.genres_lock = threading.Lock()
-        self.labels_from_sheet = []
+        self.labels_from_sheet = LabelTable(TOP_100_READ_COLUMNS)
         self.genres_in_success = []
         self.genres_in_failure = []
         self.last_row = 0
         self.is_hype = False
 
-    def run(self):
-        with ThreadPoolExecutor(max_workers=THREADS_NUMBER) as executor:
-            executor.map(self._process_top_100, [genre for genre in BeatstatsGenre])
+    def run(self, engine: str = FETCH_ENGINE):
+        if engine == FetchEngine.ASYNCIO.value:
+            asyncio.run(self._run_async())
+        else:
+            with ThreadPoolExecutor(max_workers=THREADS_NUMBER) as executor:
+                executor.map(self._process_top_100, [genre for genre in BeatstatsGenre])
 
         if self.genres_in_success:
+            sheet_labels = self._load_sheet_snapshot()
+            pending_updates = {}
             for success_info in self.genres_in_success:
-                self._refresh_sheet_data(success_info['genre'])
-                sheet_labels = self._extract_labels_name_and_beatport_link_from_sheet()
+                self._set_hype(success_info['genre'])
                 filter_labels = self._filter_beatstats_labels(sheet_labels, success_info)
                 if filter_labels:
-                    updates = self.sheets_manager.prepare_batch_updates_for_beatstats(filter_labels)
-                    success = self.sheets_manager.batch_update_in_chunks(updates)
-                    if not success:
-                        self.logger.error('Failed to perform batch update')
+                    self._apply_to_snapshot(sheet_labels, filter_labels)
+                    self._add_pending_updates(pending_updates, filter_labels)
                 else:
                     self.logger.info(f'No updates to perform for genre {success_info["genre"]}')
+            if pending_updates:
+                updates = self.sheets_manager.prepare_batch_updates_for_beatstats(list(pending_updates.values()))
+                success = self.sheets_manager.batch_update_in_chunks(updates)
+                if not success:
+                    self.logger.error('Failed to perform batch update')
         else:
             self.logger.info('No updates to perform for any genre')
 
-    def _refresh_sheet_data(self, genre:BeatstatsGenre):
-        self.labels_from_sheet = self.sheets_manager.read_columns('Labels!A2:A,C2:C,T2:T,R2:R,V2:V')
-        self.last_row = len(self.labels_from_sheet) + 1
+    def _load_sheet_snapshot(self):
+        self.labels_from_sheet = self.sheets_manager.read_columns(TOP_100_READ_COLUMNS, BEATSTATS_UPDATE_COLUMNS)
+        self.last_row = self.labels_from_sheet.get_last_row()
+        return self.labels_from_sheet
+
+    def _set_hype(self, genre: BeatstatsGenre):
         self.is_hype = genre in [
             BeatstatsGenre.HYPE_TECHNO_PEAK_TIME.name,
             BeatstatsGenre.HYPE_MELODIC_HOUSE_TECHNO.name,
         ]
 
+    @staticmethod
+    def _apply_to_snapshot(sheet_labels: LabelTable, filter_labels):
+        for label in filter_labels:
+            values = {LabelColumn.GENRE: label.get('genre', ''),
+                      LabelColumn.POSITION: label.get('position', ''),
+                      LabelColumn.BEATSTATS_FLAG: OUI}
+            if label['row'] > sheet_labels.get_last_row():
+                sheet_labels.append({**values,
+                                     LabelColumn.NAME: label.get('name', ''),
+                                     LabelColumn.BEATPORT_URL: label.get(TypeLink.BEATPORT_URL.name, '')})
+                continue
+            for column, value in values.items():
+                sheet_labels.set_cell(label['row'], column, value)
+
+    @staticmethod
+    def _add_pending_updates(pending_updates, filter_labels):
+        for label in filter_labels:
+            previous = pending_updates.get(label['row'])
+            merged = {**previous, **label} if previous else dict(label)
+            if previous:
+                merged['update_label'] = previous.get('update_label', False) and label.get('update_label', False)
+            pending_updates[label['row']] = merged
+
     def _process_top_100(self, genre: BeatstatsGenre):
         self.logger.info(f'Processing top 100 from Beatstats for {genre.name}')
         try:
             beatstats_labels = self.beatstats_manager.get_top_100_by_genre(genre.value)
-            with self.genres_lock:
-                self.genres_in_success.append({'genre': genre.name, 'labels': beatstats_labels})
+            self._add_genre_to_success(genre, beatstats_labels)
         except Exception as e:
-            self.logger.error(f'Error processing top 100 for {genre.name}: {str(e)}')
-            with self.genres_lock:
-                self.genres_in_failure.append({'genre': genre.name, 'reason': f'Error processing top 100: {str(e)}'})
-
-    def _extract_labels_name_and_beatport_link_from_sheet(self):
-        return [
-            {'row': row[0],
-             'name': row[1],
-             'genre': row[2],
-             'position': row[3],
-             TypeLink.BEATPORT_URL.name: row[4],
-             'beatstats_flag': row[5]}
-            for row in self.labels_from_sheet
-        ]
+            self._add_genre_to_failure(genre, e)
+
+    async def _run_async(self):
+        async with AsyncRequestsHelper() as helper:
+            beatstats_manager = AsyncBeatstatsManager(helper)
+            await asyncio.gather(*(self._process_top_100_async(beatstats_manager, genre) for genre in BeatstatsGenre))
+
+    async def _process_top_100_async(self, beatstats_manager: AsyncBeatstatsManager, genre: BeatstatsGenre):
+        self.logger.info(f'Processing top 100 from Beatstats for {genre.name}')
+        try:
+            beatstats_labels = await beatstats_manager.get_top_100_by_genre(genre.value)
+            self._add_genre_to_success(genre, beatstats_labels)
+        except Exception as e:
+            self._add_genre_to_failure(genre, e)
+
+    def _add_genre_to_success(self, genre: BeatstatsGenre, beatstats_labels):
+        with self.genres_lock:
+            self.genres_in_success.append({'genre': genre.name, 'labels': beatstats_labels})
+
+    def _add_genre_to_failure(self, genre: BeatstatsGenre, e: Exception):
+        self.logger.error(f'Error processing top 100 for {genre.name}: {str(e)}')
+        with self.genres_lock:
+            self.genres_in_failure.append({'genre': genre.name, 'reason': f'Error processing top 100: {str(e)}'})
+
+    @staticmethod
+    def _record_to_label(record: LabelRecord):
+        return {'row': record.row,
+                'name': record.name,
+                'genre': record.get(LabelColumn.GENRE),
+                'position': record.get(LabelColumn.POSITION),
+                TypeLink.BEATPORT_URL.name: record.get(LabelColumn.BEATPORT_URL),
+                'beatstats_flag': record.get(LabelColumn.BEATSTATS_FLAG)}
 
-    def _filter_beatstats_labels(self, sheet_labels, success_info):
-        sheet_urls = {label[TypeLink.BEATPORT_URL.name]: label for label in sheet_labels if
-                      TypeLink.BEATPORT_URL.name in label}
+    def _filter_beatstats_labels(self, sheet_labels: LabelTable, success_info):
+        sheet_urls = {label.get(LabelColumn.BEATPORT_URL): label for label in sheet_labels}
         beatstats_labels = success_info['labels']
         updated_labels = []
 
@@ -80,11 +132,11 @@ class TopProcessor:
             sheet_label = None
 
             if TypeLink.BEATPORT_URL.name in label and label[TypeLink.BEATPORT_URL.name] in sheet_urls:
-                sheet_label = sheet_urls[label[TypeLink.BEATPORT_URL.name]].copy()
+                sheet_label = self._record_to_label(sheet_urls[label[TypeLink.BEATPORT_URL.name]])
             elif 'name' in label:
                 best_match = find_best_match(label['name'], sheet_labels, 99)
                 if best_match:
-                    sheet_label = best_match.copy()
+                    sheet_label = self._record_to_label(best_match)
 
             if sheet_label:
                 updated_label = self._update_label_with_position_and_genre(sheet_label, label)
@@ -1,2 +1,11 @@
 from .playwright_scrapper import PlaywrightScrapper
+from .browser_pool import BrowserPool
+from .http_client import HttpClient
 from .requests_helper import RequestsHelper
+from .async_requests_helper import AsyncRequestsHelper
+from .rate_limiter import RateLimiter, HostRateLimiter
+from .response_cache import ResponseCache
+from .async_browser_pool import AsyncBrowserPool
+from .songstats_session import SongstatsSession
+from .songstats_payload_extractor import SongstatsPayloadExtractor
+from .browser_server import BrowserServer
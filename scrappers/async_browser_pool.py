@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+from playwright.async_api import Page, Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+from constants import SONGSTATS_ASYNC_MAX_PAGES, BROWSER_PAGE_MAX_USES
+from loggers import AppLogger
+from .playwright_scrapper import PlaywrightScrapper
+
+
+class PageSlot:
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+
+
+class AsyncBrowserPool:
+    def __init__(self, max_pages: int = SONGSTATS_ASYNC_MAX_PAGES, max_page_uses: int = BROWSER_PAGE_MAX_USES):
+        self.logger = AppLogger().get_logger()
+        self.scrapper = PlaywrightScrapper()
+        self.max_pages = max_pages
+        self.max_page_uses = max_page_uses
+        self.semaphore = None
+        self.playwright = None
+        self.browser = None
+        self.idle_slots: List[PageSlot] = []
+        self.stats = {'browsers_launched': 0, 'pages_created': 0, 'pages_recycled': 0, 'checkouts': 0}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def start(self):
+        self.semaphore = asyncio.Semaphore(self.max_pages)
+        self.playwright = await async_playwright().start()
+        await self._ensure_browser()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        async with self.semaphore:
+            slot = await self._checkout_slot()
+            try:
+                yield slot.page
+            finally:
+                await self._release_slot(slot)
+
+    async def close(self):
+        for slot in self.idle_slots:
+            await self._close_slot(slot)
+        self.idle_slots = []
+        try:
+            if self.browser is not None:
+                await self.scrapper.close_browser_async(self.browser)
+            if self.playwright is not None:
+                await self.playwright.stop()
+        except PlaywrightError as e:
+            self.logger.warning(f'Error while closing browser: {e}')
+        self.browser = None
+        self.playwright = None
+        self.logger.info(f'Async browser pool stats: {dict(self.stats, resources=self.scrapper.get_resource_stats())}')
+
+    async def _ensure_browser(self):
+        if self.browser is None or not self.browser.is_connected():
+            self.idle_slots = []
+            self.browser = await self.scrapper.launch_browser_async(self.playwright)
+            self.stats['browsers_launched'] += 1
+
+    async def _checkout_slot(self) -> PageSlot:
+        await self._ensure_browser()
+        self.stats['checkouts'] += 1
+        while self.idle_slots:
+            slot = self.idle_slots.pop()
+            if not slot.crashed and not slot.page.is_closed():
+                return slot
+            await self._close_slot(slot)
+        slot = PageSlot(*await self.scrapper.open_page_async(self.browser))
+        slot.page.on('crash', lambda _: setattr(slot, 'crashed', True))
+        self.stats['pages_created'] += 1
+        return slot
+
+    async def _release_slot(self, slot: PageSlot):
+        slot.uses += 1
+        if slot.crashed or slot.uses >= self.max_page_uses:
+            await self._close_slot(slot)
+            self.stats['pages_recycled'] += 1
+            return
+        try:
+            await slot.page.goto('about:blank')
+            self.idle_slots.append(slot)
+        except PlaywrightError as e:
+            self.logger.warning(f'Could not reset page, recycling it: {e}')
+            await self._close_slot(slot)
+            self.stats['pages_recycled'] += 1
+
+    async def _close_slot(self, slot: PageSlot):
+        try:
+            await self.scrapper.close_page_async(slot.context, slot.page)
+        except PlaywrightError as e:
+            self.logger.warning(f'Error while closing browser context: {e}')
@@ -0,0 +1,100 @@
+import asyncio
+
+import aiohttp
+
+from constants import MAX_RETRIES, REQUEST_TIMEOUT, ASYNC_MAX_CONCURRENCY, ASYNC_LIMIT_PER_HOST, STREAM_CHUNK_SIZE
+from enums import StatusCode
+from utils.utils import normalize_url
+from .embedded_json_extractor import EmbeddedJsonExtractor
+from .rate_limiter import RateLimiter
+from .requests_helper import RequestsHelper
+from .single_flight import AsyncSingleFlight
+
+
+class AsyncRequestsHelper(RequestsHelper):
+    def __init__(self):
+        super().__init__()
+        self.session = None
+        self.single_flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def scrap_with_requests(self, url, type_link):
+        return await self.single_flight.do((type_link, normalize_url(url)),
+                                           lambda: self._scrap_with_requests(url, type_link))
+
+    async def _scrap_with_requests(self, url, type_link):
+        cached = await asyncio.to_thread(self._lookup_cache, url, type_link)
+        if cached and cached['is_fresh']:
+            self.logger.info(f'Scrap url: {url} served from cache')
+            return await asyncio.to_thread(self._process_response, cached['content'], type_link)
+        backoff_time = 5
+        limiter = RateLimiter.get_limiter(type_link)
+        for _ in range(MAX_RETRIES):
+            try:
+                await self._wait_for_rate_limit_async(limiter)
+                async with self._get_session().get(url, headers=self._build_headers(cached)) as response:
+                    status_code = response.status
+                    self.logger.info(f'Scrap url: {url} with status: {status_code}')
+                    if status_code == StatusCode.NOT_MODIFIED.value and cached:
+                        limiter.on_success()
+                        await asyncio.to_thread(self.cache.refresh, url, response.headers)
+                        return await asyncio.to_thread(self._process_response, cached['content'], type_link)
+                    if status_code == StatusCode.SUCCESS.value:
+                        if self._should_stream(type_link):
+                            content = await self._read_streamed_async(response, type_link)
+                        else:
+                            content = await response.read()
+                        limiter.on_success()
+                        return await asyncio.to_thread(self._process_and_cache, url, type_link, content,
+                                                       response.headers)
+                    retry_after = self._update_limiter(limiter, status_code, response.headers.get('Retry-After'))
+                retry_delay = self._get_retry_delay(status_code, backoff_time, retry_after)
+                if retry_delay is None:
+                    return None
+                await asyncio.sleep(retry_delay)
+                if status_code == StatusCode.TOO_MANY_REQUESTS.value:
+                    backoff_time *= 2
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.error(f'Request error: {e}')
+                await asyncio.sleep(backoff_time)
+                backoff_time *= 2
+                continue
+        self.logger.warning('Max retries reached. Exiting.')
+        return None
+
+    async def _read_streamed_async(self, response, type_link):
+        buffer = bytearray()
+        scanner = EmbeddedJsonExtractor.payload_scanner(type_link)
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            buffer.extend(chunk)
+            payload_end = scanner.find_payload_end(buffer)
+            if payload_end is not None:
+                content_length = None if response.headers.get('Content-Encoding') else response.content_length
+                self._record_streamed_response(str(content_length) if content_length else None, len(buffer), True)
+                return bytes(buffer[:payload_end])
+        self._record_streamed_response(None, 0, False)
+        return bytes(buffer)
+
+    @staticmethod
+    async def _wait_for_rate_limit_async(limiter):
+        while (wait := limiter.try_acquire()) > 0:
+            await asyncio.sleep(wait)
+
+    async def close(self):
+        self.logger.info(f'Async request coalescing stats: {self.single_flight.stats()}')
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=ASYNC_MAX_CONCURRENCY, limit_per_host=ASYNC_LIMIT_PER_HOST)
+            self.session = aiohttp.ClientSession(connector=connector,
+                                                 timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+        return self.session
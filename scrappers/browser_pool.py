@@ -0,0 +1,144 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Callable, Iterable, Any
+
+from playwright.sync_api import Page, Error as PlaywrightError
+from playwright.sync_api import sync_playwright
+
+from constants import BROWSER_POOL_MAX_CONTEXTS, BROWSER_PAGE_MAX_USES
+from loggers import AppLogger
+from .playwright_scrapper import PlaywrightScrapper
+
+STOP = object()
+
+
+class BrowserSlot:
+    def __init__(self, playwright):
+        self.playwright = playwright
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.uses = 0
+        self.crashed = False
+
+
+class BrowserPool:
+    def __init__(self, max_contexts: int = BROWSER_POOL_MAX_CONTEXTS, max_page_uses: int = BROWSER_PAGE_MAX_USES):
+        self.logger = AppLogger().get_logger()
+        self.scrapper = PlaywrightScrapper()
+        self.max_page_uses = max_page_uses
+        self.semaphore = threading.BoundedSemaphore(max_contexts)
+        self.local = threading.local()
+        self.slots: List[BrowserSlot] = []
+        self.lock = threading.Lock()
+        self.stats = {'browsers_launched': 0, 'pages_created': 0, 'pages_recycled': 0, 'checkouts': 0}
+
+    @contextmanager
+    def page(self) -> Iterator[Page]:
+        with self.semaphore:
+            slot = self._get_slot()
+            page = self._checkout_page(slot)
+            try:
+                yield page
+            finally:
+                self._release_page(slot)
+
+    def map(self, function: Callable[[Any], Any], items: Iterable[Any], max_workers: int):
+        iterator = iter(items)
+        iterator_lock = threading.Lock()
+        iterator_errors = []
+
+        def worker():
+            try:
+                while True:
+                    with iterator_lock:
+                        try:
+                            item = next(iterator, STOP) if not iterator_errors else STOP
+                        except Exception as e:
+                            iterator_errors.append(e)
+                            item = STOP
+                    if item is STOP:
+                        return
+                    try:
+                        function(item)
+                    except Exception as e:
+                        self.logger.error(f'Error in browser worker: {e}')
+            finally:
+                self.release_thread_resources()
+
+        workers = [threading.Thread(target=worker, name=f'browser-worker-{index}') for index in range(max_workers)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        if iterator_errors:
+            raise iterator_errors[0]
+
+    def release_thread_resources(self):
+        slot = getattr(self.local, 'slot', None)
+        if slot is None:
+            return
+        self._close_context(slot)
+        try:
+            if slot.browser is not None:
+                self.scrapper.close_browser(slot.browser)
+            slot.playwright.stop()
+        except PlaywrightError as e:
+            self.logger.warning(f'Error while closing browser: {e}')
+        with self.lock:
+            self.slots.remove(slot)
+        self.local.slot = None
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, open_browsers=len(self.slots), resources=self.scrapper.get_resource_stats())
+
+    def _get_slot(self) -> BrowserSlot:
+        slot = getattr(self.local, 'slot', None)
+        if slot is None:
+            slot = BrowserSlot(sync_playwright().start())
+            self.local.slot = slot
+            with self.lock:
+                self.slots.append(slot)
+        if slot.browser is None or not slot.browser.is_connected():
+            self._close_context(slot)
+            slot.browser = self.scrapper.launch_browser(slot.playwright)
+            self._increment('browsers_launched')
+        return slot
+
+    def _checkout_page(self, slot: BrowserSlot) -> Page:
+        if slot.page is None or slot.crashed or slot.page.is_closed():
+            self._close_context(slot)
+            slot.context, slot.page = self.scrapper.open_page(slot.browser)
+            slot.page.on('crash', lambda _: setattr(slot, 'crashed', True))
+            self._increment('pages_created')
+        self._increment('checkouts')
+        return slot.page
+
+    def _release_page(self, slot: BrowserSlot):
+        slot.uses += 1
+        if slot.crashed or slot.uses >= self.max_page_uses:
+            self._close_context(slot)
+            self._increment('pages_recycled')
+            return
+        try:
+            slot.page.goto('about:blank')
+        except PlaywrightError as e:
+            self.logger.warning(f'Could not reset page, recycling it: {e}')
+            self._close_context(slot)
+            self._increment('pages_recycled')
+
+    def _close_context(self, slot: BrowserSlot):
+        if slot.context is not None:
+            try:
+                self.scrapper.close_page(slot.context, slot.page)
+            except PlaywrightError as e:
+                self.logger.warning(f'Error while closing browser context: {e}')
+        slot.context = None
+        slot.page = None
+        slot.uses = 0
+        slot.crashed = False
+
+    def _increment(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
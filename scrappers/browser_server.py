@@ -0,0 +1,62 @@
+import os
+import random
+import subprocess
+import threading
+import time
+
+import requests
+
+from constants import BROWSER_SERVER_PORT, BROWSER_SERVER_PROFILE_DIR, BROWSER_SERVER_STARTUP_TIMEOUT, USER_AGENTS
+from loggers import AppLogger
+from .http_client import HttpClient
+
+
+class BrowserServer:
+    _lock = threading.Lock()
+    _process = None
+
+    @staticmethod
+    def get_endpoint() -> str:
+        return f'http://127.0.0.1:{BROWSER_SERVER_PORT}'
+
+    @staticmethod
+    def ensure_running(executable_path: str) -> str:
+        endpoint = BrowserServer.get_endpoint()
+        with BrowserServer._lock:
+            if BrowserServer.is_running():
+                return endpoint
+            BrowserServer._launch(executable_path)
+            deadline = time.monotonic() + BROWSER_SERVER_STARTUP_TIMEOUT
+            while time.monotonic() < deadline:
+                if BrowserServer.is_running():
+                    return endpoint
+                time.sleep(0.2)
+        raise RuntimeError(f'Browser server did not start on {endpoint} within {BROWSER_SERVER_STARTUP_TIMEOUT}s')
+
+    @staticmethod
+    def is_running() -> bool:
+        try:
+            response = HttpClient.get_session().get(f'{BrowserServer.get_endpoint()}/json/version', timeout=1)
+            return response.ok
+        except requests.RequestException:
+            return False
+
+    @staticmethod
+    def _launch(executable_path: str):
+        logger = AppLogger().get_logger()
+        os.makedirs(BROWSER_SERVER_PROFILE_DIR, exist_ok=True)
+        args = [
+            executable_path,
+            '--headless=new',
+            f'--remote-debugging-port={BROWSER_SERVER_PORT}',
+            f'--user-data-dir={os.path.abspath(BROWSER_SERVER_PROFILE_DIR)}',
+            f'--user-agent={random.choice(USER_AGENTS)}',
+            '--lang=fr-FR',
+            '--no-first-run',
+            '--no-default-browser-check',
+            'about:blank'
+        ]
+        logger.info(f'Launching browser server on port {BROWSER_SERVER_PORT} '
+                    f'with profile {BROWSER_SERVER_PROFILE_DIR}')
+        BrowserServer._process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                                  start_new_session=True)
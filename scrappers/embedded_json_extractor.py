@@ -0,0 +1,67 @@
+import json
+from typing import Any, Optional
+
+from constants import BEATPORT_SCRIPT_ID, SOUNDCLOUD_SCRIPT_ID
+from enums import TypeLink
+
+SCRIPT_END_MARKER = b'</script>'
+
+
+class PayloadScanner:
+    def __init__(self, marker: Optional[bytes]):
+        self.marker = marker
+        self.marker_index = -1
+        self.offset = 0
+
+    def find_payload_end(self, content: bytes) -> Optional[int]:
+        if self.marker is None:
+            return None
+        if self.marker_index == -1:
+            self.marker_index = content.find(self.marker, self.offset)
+            if self.marker_index == -1:
+                self.offset = max(0, len(content) - len(self.marker) + 1)
+                return None
+            self.offset = self.marker_index
+        end = content.find(SCRIPT_END_MARKER, self.offset)
+        if end == -1:
+            self.offset = max(self.marker_index, len(content) - len(SCRIPT_END_MARKER) + 1)
+            return None
+        return end + len(SCRIPT_END_MARKER)
+
+
+class EmbeddedJsonExtractor:
+    _decoder = json.JSONDecoder()
+    _payload_markers = {
+        TypeLink.BEATPORT_URL: f'id="{BEATPORT_SCRIPT_ID}"'.encode(),
+        TypeLink.SOUNDCLOUD_URL: SOUNDCLOUD_SCRIPT_ID.encode(),
+    }
+
+    @staticmethod
+    def payload_scanner(type_link: TypeLink) -> 'PayloadScanner':
+        return PayloadScanner(EmbeddedJsonExtractor._payload_markers.get(type_link))
+
+    @staticmethod
+    def extract_beatport_data(content: bytes) -> Optional[Any]:
+        marker_index = content.find(f'id="{BEATPORT_SCRIPT_ID}"'.encode())
+        if marker_index == -1:
+            return None
+        start = content.find(b'>', marker_index)
+        end = content.find(SCRIPT_END_MARKER, start)
+        if start == -1 or end == -1:
+            return None
+        return json.loads(content[start + 1:end])
+
+    @staticmethod
+    def extract_soundcloud_data(content: bytes) -> Optional[Any]:
+        marker_index = content.find(SOUNDCLOUD_SCRIPT_ID.encode())
+        if marker_index == -1:
+            return None
+        equal_index = content.find(b'=', marker_index + len(SOUNDCLOUD_SCRIPT_ID))
+        end = content.find(SCRIPT_END_MARKER, marker_index)
+        if equal_index == -1 or end == -1:
+            return None
+        payload = content[equal_index + 1:end].decode('utf-8').lstrip()
+        if not payload.startswith('['):
+            return None
+        data, _ = EmbeddedJsonExtractor._decoder.raw_decode(payload)
+        return data
@@ -0,0 +1,182 @@
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Optional
+
+from bs4 import BeautifulSoup, NavigableString
+
+from constants import HTML_PARSER_BACKEND, BEATSTATS_CONTENT_ID, BEATSTATS_LABEL_NAME_CLASS, BEATSTATS_POSITION_ID, \
+    BANDCAMP_RESULT_CLASS
+from enums import HtmlParserBackend
+from loggers import AppLogger
+
+
+class BeatstatsRecord(NamedTuple):
+    name: str
+    link: str
+    position: str
+
+
+class BandcampRecord(NamedTuple):
+    name: Optional[str]
+    link: Optional[str]
+    genre: Optional[str]
+    subhead: Optional[str]
+
+
+class HtmlParser(ABC):
+    backend = None
+
+    @abstractmethod
+    def parse_beatstats(self, content: bytes) -> List[BeatstatsRecord]:
+        pass
+
+    @abstractmethod
+    def parse_bandcamp(self, content: bytes) -> List[BandcampRecord]:
+        pass
+
+    @staticmethod
+    def create(backend: str = HTML_PARSER_BACKEND) -> 'HtmlParser':
+        parsers = {
+            HtmlParserBackend.HTML_PARSER.value: SoupHtmlParser,
+            HtmlParserBackend.LXML.value: LxmlHtmlParser,
+            HtmlParserBackend.SELECTOLAX.value: SelectolaxHtmlParser,
+        }
+        parser_class = parsers.get(backend)
+        if parser_class is None:
+            raise ValueError(f'Unknown HTML parser backend: {backend}')
+        try:
+            return parser_class()
+        except ImportError as e:
+            AppLogger.get_logger().warning(f'HTML parser backend {backend} unavailable ({e}), using html.parser')
+            return SoupHtmlParser()
+
+    @staticmethod
+    def _build_beatstats_records(names, hrefs, positions) -> List[BeatstatsRecord]:
+        beatport_hrefs = [href for href in hrefs if href and href.startswith('/label')]
+        return [BeatstatsRecord(name, href, position) for name, href, position in zip(names, beatport_hrefs, positions)]
+
+    @staticmethod
+    def _genre_from_text(text: Optional[str]) -> Optional[str]:
+        return text.strip().split(': ')[-1] if text is not None else None
+
+
+class SoupHtmlParser(HtmlParser):
+    backend = HtmlParserBackend.HTML_PARSER.value
+
+    def parse_beatstats(self, content: bytes) -> List[BeatstatsRecord]:
+        soup = BeautifulSoup(content, 'html.parser')
+        try:
+            content_artists = soup.find(id=BEATSTATS_CONTENT_ID)
+            if not content_artists:
+                return []
+            names = [span.text.strip() for span in content_artists.find_all('span', class_=BEATSTATS_LABEL_NAME_CLASS)]
+            hrefs = [link.get('href') for link in content_artists.find_all('a')]
+            positions = [div.contents[0].strip() for div in content_artists.find_all('div', id=BEATSTATS_POSITION_ID)
+                         if div.contents and isinstance(div.contents[0], NavigableString)]
+            return self._build_beatstats_records(names, hrefs, positions)
+        finally:
+            soup.decompose()
+
+    def parse_bandcamp(self, content: bytes) -> List[BandcampRecord]:
+        soup = BeautifulSoup(content, 'html.parser')
+        try:
+            records = []
+            for info in soup.find_all(class_=BANDCAMP_RESULT_CLASS):
+                genre_div = info.find(class_='genre')
+                heading = info.find(class_='heading')
+                itemurl = info.find(class_='itemurl')
+                subhead = info.find(class_='subhead')
+                records.append(BandcampRecord(
+                    name=(heading.a.text.strip() if heading.a else '') if heading else None,
+                    link=(itemurl.a.get('href') or '' if itemurl.a else '') if itemurl else None,
+                    genre=self._genre_from_text(genre_div.text) if genre_div else None,
+                    subhead=subhead.text if subhead else None
+                ))
+            return records
+        finally:
+            soup.decompose()
+
+
+class LxmlHtmlParser(HtmlParser):
+    backend = HtmlParserBackend.LXML.value
+
+    def __init__(self):
+        from lxml import html
+        self.html = html
+
+    def parse_beatstats(self, content: bytes) -> List[BeatstatsRecord]:
+        tree = self.html.fromstring(content)
+        content_artists = tree.xpath(f'//*[@id="{BEATSTATS_CONTENT_ID}"]')
+        if not content_artists:
+            return []
+        root = content_artists[0]
+        names = [span.text_content().strip() for span in
+                 root.xpath(f'.//span[{self._class_xpath(BEATSTATS_LABEL_NAME_CLASS)}]')]
+        hrefs = root.xpath('.//a/@href')
+        positions = [div.text.strip() for div in root.xpath(f'.//div[@id="{BEATSTATS_POSITION_ID}"]') if div.text]
+        return self._build_beatstats_records(names, hrefs, positions)
+
+    def parse_bandcamp(self, content: bytes) -> List[BandcampRecord]:
+        tree = self.html.fromstring(content)
+        records = []
+        for info in tree.xpath(f'//*[{self._class_xpath(BANDCAMP_RESULT_CLASS)}]'):
+            genre_div = self._first(info.xpath(f'.//*[{self._class_xpath("genre")}]'))
+            heading = self._first(info.xpath(f'.//*[{self._class_xpath("heading")}]'))
+            itemurl = self._first(info.xpath(f'.//*[{self._class_xpath("itemurl")}]'))
+            subhead = self._first(info.xpath(f'.//*[{self._class_xpath("subhead")}]'))
+            heading_link = self._first(heading.xpath('.//a')) if heading is not None else None
+            itemurl_link = self._first(itemurl.xpath('.//a')) if itemurl is not None else None
+            records.append(BandcampRecord(
+                name=(heading_link.text_content().strip() if heading_link is not None else '')
+                if heading is not None else None,
+                link=(itemurl_link.get('href') or '' if itemurl_link is not None else '')
+                if itemurl is not None else None,
+                genre=self._genre_from_text(genre_div.text_content()) if genre_div is not None else None,
+                subhead=subhead.text_content() if subhead is not None else None
+            ))
+        return records
+
+    @staticmethod
+    def _class_xpath(class_name: str) -> str:
+        return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+    @staticmethod
+    def _first(elements):
+        return elements[0] if elements else None
+
+
+class SelectolaxHtmlParser(HtmlParser):
+    backend = HtmlParserBackend.SELECTOLAX.value
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self.html_parser = LexborHTMLParser
+
+    def parse_beatstats(self, content: bytes) -> List[BeatstatsRecord]:
+        tree = self.html_parser(content)
+        root = tree.css_first(f'#{BEATSTATS_CONTENT_ID}')
+        if root is None:
+            return []
+        names = [span.text().strip() for span in root.css(f'span.{BEATSTATS_LABEL_NAME_CLASS}')]
+        hrefs = [link.attributes.get('href') for link in root.css('a')]
+        positions = [div.child.text().strip() for div in root.css(f'div[id="{BEATSTATS_POSITION_ID}"]')
+                     if div.child is not None and div.child.tag == '-text']
+        return self._build_beatstats_records(names, hrefs, positions)
+
+    def parse_bandcamp(self, content: bytes) -> List[BandcampRecord]:
+        tree = self.html_parser(content)
+        records = []
+        for info in tree.css(f'.{BANDCAMP_RESULT_CLASS}'):
+            genre_div = info.css_first('.genre')
+            heading = info.css_first('.heading')
+            itemurl = info.css_first('.itemurl')
+            subhead = info.css_first('.subhead')
+            heading_link = heading.css_first('a') if heading is not None else None
+            itemurl_link = itemurl.css_first('a') if itemurl is not None else None
+            records.append(BandcampRecord(
+                name=(heading_link.text().strip() if heading_link is not None else '') if heading is not None else None,
+                link=(itemurl_link.attributes.get('href') or '' if itemurl_link is not None else '')
+                if itemurl is not None else None,
+                genre=self._genre_from_text(genre_div.text()) if genre_div is not None else None,
+                subhead=subhead.text() if subhead is not None else None
+            ))
+        return records
@@ -0,0 +1,58 @@
+import atexit
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from constants import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+from loggers import AppLogger
+
+
+class HttpClient:
+    _session = None
+    _lock = threading.Lock()
+    _pool_connections = HTTP_POOL_CONNECTIONS
+    _pool_maxsize = HTTP_POOL_MAXSIZE
+    _shutdown_registered = False
+
+    @staticmethod
+    def get_session() -> requests.Session:
+        if HttpClient._session is None:
+            with HttpClient._lock:
+                if HttpClient._session is None:
+                    HttpClient._session = HttpClient._build_session()
+                    if not HttpClient._shutdown_registered:
+                        atexit.register(HttpClient.close)
+                        HttpClient._shutdown_registered = True
+        return HttpClient._session
+
+    @staticmethod
+    def configure(pool_connections: int = None, pool_maxsize: int = None):
+        with HttpClient._lock:
+            if pool_connections is not None:
+                HttpClient._pool_connections = pool_connections
+            if pool_maxsize is not None:
+                HttpClient._pool_maxsize = pool_maxsize
+            if HttpClient._session is not None:
+                HttpClient._session.close()
+                HttpClient._session = None
+
+    @staticmethod
+    def close():
+        with HttpClient._lock:
+            if HttpClient._session is not None:
+                HttpClient._session.close()
+                HttpClient._session = None
+                AppLogger.get_logger().info('Shared HTTP client closed')
+
+    @staticmethod
+    def _build_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HttpClient._pool_connections,
+                              pool_maxsize=HttpClient._pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        AppLogger.get_logger().info(
+            f'Shared HTTP client created (pool_connections={HttpClient._pool_connections}, '
+            f'pool_maxsize={HttpClient._pool_maxsize})')
+        return session
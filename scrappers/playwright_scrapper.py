@@ -1,21 +1,71 @@
+import asyncio
 import random
-from typing import List
+import threading
+from typing import List, Dict, Tuple
+from urllib.parse import urlsplit
 
-from playwright.sync_api import Page, Request
+from playwright.async_api import Browser as AsyncBrowser, BrowserContext as AsyncBrowserContext, Page as AsyncPage
+from playwright.async_api import Playwright as AsyncPlaywrightInstance, Route as AsyncRoute
+from playwright.sync_api import Page, Browser, BrowserContext, Route, Response
 from playwright.sync_api import Playwright as PlaywrightInstance
 
-from constants import USER_AGENTS
+from constants import USER_AGENTS, PLAYWRIGHT_RESOURCE_BLOCKING_ENABLED, PLAYWRIGHT_BLOCKED_RESOURCE_TYPES, \
+    PLAYWRIGHT_ALLOWED_HOSTS, BROWSER_SERVER_ENABLED
 from loggers import AppLogger
+from .browser_server import BrowserServer
 
 
-class RequestInterceptor:
-    def __init__(self, url_pattern: str):
-        self.url_pattern = url_pattern
-        self.requests: List[Request] = []
+class ResourceBlocker:
+    def __init__(self, blocked_resource_types: List[str] = None, allowed_hosts: List[str] = None):
+        self.blocked_resource_types = set(PLAYWRIGHT_BLOCKED_RESOURCE_TYPES if blocked_resource_types is None
+                                          else blocked_resource_types)
+        self.allowed_hosts = PLAYWRIGHT_ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts
+        self.lock = threading.Lock()
+        self.blocked_by_type: Dict[str, int] = {}
+        self.allowed_requests = 0
+        self.loaded_bytes = 0
 
-    def __call__(self, request: Request):
-        if self.url_pattern in request.url:
-            self.requests.append(request)
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blocked_resource_types:
+            return True
+        host = urlsplit(url).hostname
+        if not host or not self.allowed_hosts:
+            return False
+        return not any(host == allowed_host or host.endswith(f'.{allowed_host}') for allowed_host in self.allowed_hosts)
+
+    def handle_route(self, route: Route):
+        if self._filter(route.request.resource_type, route.request.url):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_route_async(self, route: AsyncRoute):
+        if self._filter(route.request.resource_type, route.request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def on_response(self, response: Response):
+        content_length = response.headers.get('content-length', '')
+        if content_length.isdigit():
+            with self.lock:
+                self.loaded_bytes += int(content_length)
+
+    def get_stats(self):
+        with self.lock:
+            return {'blocked_requests': sum(self.blocked_by_type.values()),
+                    'blocked_by_type': dict(self.blocked_by_type),
+                    'allowed_requests': self.allowed_requests,
+                    'loaded_bytes': self.loaded_bytes}
+
+    def _filter(self, resource_type: str, url: str) -> bool:
+        blocked = self.should_block(resource_type, url)
+        with self.lock:
+            if blocked:
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            else:
+                self.allowed_requests += 1
+        return blocked
 
 
 class PlaywrightScrapper:
@@ -24,23 +74,105 @@ class PlaywrightScrapper:
         self.user_agents = USER_AGENTS
         self.context = None
         self.browser = None
+        self.resource_blocker = ResourceBlocker() if PLAYWRIGHT_RESOURCE_BLOCKING_ENABLED else None
+        self.use_browser_server = BROWSER_SERVER_ENABLED
 
     def init_playwright_page(self, p: PlaywrightInstance) -> Page:
-        user_agent = random.choice(self.user_agents)
-        self.browser = p.chromium.launch(headless=True)
-        self.context = self.browser.new_context(
-            user_agent=user_agent,
-            viewport={'width': 1920, 'height': 1080},
-            locale='fr-FR',
-            timezone_id='Europe/Paris'
-        )
-        page = self.context.new_page()
-        page.set_extra_http_headers({
+        self.browser = self.launch_browser(p)
+        self.context = self.new_context(self.browser)
+        return self.context.new_page()
+
+    def launch_browser(self, p: PlaywrightInstance) -> Browser:
+        if self.use_browser_server:
+            return p.chromium.connect_over_cdp(BrowserServer.ensure_running(p.chromium.executable_path))
+        return p.chromium.launch(headless=True)
+
+    def open_page(self, browser: Browser) -> Tuple[BrowserContext, Page]:
+        if not self.use_browser_server:
+            context = self.new_context(browser)
+            return context, context.new_page()
+        context = browser.contexts[0]
+        page = context.new_page()
+        page.set_viewport_size(self._get_context_options()['viewport'])
+        page.set_extra_http_headers(self._get_extra_http_headers())
+        if self.resource_blocker:
+            page.route('**/*', self.resource_blocker.handle_route)
+            page.on('response', self.resource_blocker.on_response)
+        return context, page
+
+    def close_page(self, context: BrowserContext, page: Page):
+        if self.use_browser_server:
+            page.close()
+        else:
+            context.close()
+
+    def close_browser(self, browser: Browser):
+        if not self.use_browser_server:
+            browser.close()
+
+    def new_context(self, browser: Browser) -> BrowserContext:
+        context = browser.new_context(**self._get_context_options())
+        context.set_extra_http_headers(self._get_extra_http_headers())
+        if self.resource_blocker:
+            context.route('**/*', self.resource_blocker.handle_route)
+            context.on('response', self.resource_blocker.on_response)
+        return context
+
+    async def launch_browser_async(self, p: AsyncPlaywrightInstance) -> AsyncBrowser:
+        if self.use_browser_server:
+            endpoint = await asyncio.to_thread(BrowserServer.ensure_running, p.chromium.executable_path)
+            return await p.chromium.connect_over_cdp(endpoint)
+        return await p.chromium.launch(headless=True)
+
+    async def open_page_async(self, browser: AsyncBrowser) -> Tuple[AsyncBrowserContext, AsyncPage]:
+        if not self.use_browser_server:
+            context = await self.new_context_async(browser)
+            return context, await context.new_page()
+        context = browser.contexts[0]
+        page = await context.new_page()
+        await page.set_viewport_size(self._get_context_options()['viewport'])
+        await page.set_extra_http_headers(self._get_extra_http_headers())
+        if self.resource_blocker:
+            await page.route('**/*', self.resource_blocker.handle_route_async)
+            page.on('response', self.resource_blocker.on_response)
+        return context, page
+
+    async def close_page_async(self, context: AsyncBrowserContext, page: AsyncPage):
+        if self.use_browser_server:
+            await page.close()
+        else:
+            await context.close()
+
+    async def close_browser_async(self, browser: AsyncBrowser):
+        if not self.use_browser_server:
+            await browser.close()
+
+    async def new_context_async(self, browser: AsyncBrowser) -> AsyncBrowserContext:
+        context = await browser.new_context(**self._get_context_options())
+        await context.set_extra_http_headers(self._get_extra_http_headers())
+        if self.resource_blocker:
+            await context.route('**/*', self.resource_blocker.handle_route_async)
+            context.on('response', self.resource_blocker.on_response)
+        return context
+
+    def _get_context_options(self):
+        return {
+            'user_agent': random.choice(self.user_agents),
+            'viewport': {'width': 1920, 'height': 1080},
+            'locale': 'fr-FR',
+            'timezone_id': 'Europe/Paris'
+        }
+
+    @staticmethod
+    def _get_extra_http_headers():
+        return {
             'Accept-Language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
             'Accept-Encoding': 'gzip, deflate, br',
             'Referer': 'https://www.google.com/'
-        })
-        return page
+        }
+
+    def get_resource_stats(self):
+        return self.resource_blocker.get_stats() if self.resource_blocker else {}
 
     def close_connection(self):
         self.context.close()
@@ -0,0 +1,87 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+from constants import RATE_LIMITER_INITIAL_RATE, RATE_LIMITER_MIN_RATE, RATE_LIMITER_MAX_RATE, RATE_LIMITER_BURST, \
+    RATE_LIMITER_INCREASE_STEP, RATE_LIMITER_DECREASE_FACTOR
+from enums import TypeLink
+from loggers import AppLogger
+
+
+class HostRateLimiter:
+    def __init__(self, name: str, rate: float = RATE_LIMITER_INITIAL_RATE, min_rate: float = RATE_LIMITER_MIN_RATE,
+                 max_rate: float = RATE_LIMITER_MAX_RATE, burst: int = RATE_LIMITER_BURST):
+        self.logger = AppLogger.get_logger()
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.blocked_until:
+                return self.blocked_until - now + random.uniform(0, 1 / self.rate)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate * random.uniform(1, 1.5)
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + RATE_LIMITER_INCREASE_STEP)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * RATE_LIMITER_DECREASE_FACTOR)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            self.logger.warning(f'Rate limiter {self.name}: rate lowered to {self.rate:.2f} req/s'
+                                f'{f", blocked for {retry_after:.1f}s" if retry_after is not None else ""}')
+
+    def _refill(self, now: float):
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class RateLimiter:
+    _limiters: Dict[Union[TypeLink, str], HostRateLimiter] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_limiter(key: Union[TypeLink, str]) -> HostRateLimiter:
+        with RateLimiter._lock:
+            if key not in RateLimiter._limiters:
+                RateLimiter._limiters[key] = HostRateLimiter(key.name if isinstance(key, TypeLink) else key)
+            return RateLimiter._limiters[key]
+
+    @staticmethod
+    def current_rates() -> Dict[str, float]:
+        with RateLimiter._lock:
+            return {limiter.name: round(limiter.rate, 2) for limiter in RateLimiter._limiters.values()}
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_date = parsedate_to_datetime(value)
+            return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
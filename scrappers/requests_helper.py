@@ -1,65 +1,186 @@
 import json
 import random
 import re
+import sqlite3
+import threading
 import time
 
 import requests
 from bs4 import BeautifulSoup
 
-from constants import MAX_RETRIES, BEATPORT_SCRIPT_ID, SOUNDCLOUD_SCRIPT_ID, USER_AGENTS
+from constants import MAX_RETRIES, BEATPORT_SCRIPT_ID, SOUNDCLOUD_SCRIPT_ID, USER_AGENTS, REQUEST_TIMEOUT, \
+    CACHE_ENABLED, STREAMING_FETCH_ENABLED, STREAMED_TYPE_LINKS, STREAM_CHUNK_SIZE
 from enums import StatusCode, TypeLink
 from loggers import AppLogger
+from utils.utils import normalize_url
+from .embedded_json_extractor import EmbeddedJsonExtractor
+from .html_parsers import HtmlParser
+from .http_client import HttpClient
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
 
 
 class RequestsHelper:
+    _stream_stats = {'streamed': 0, 'stopped_early': 0, 'bytes_saved': 0, 'bytes_saved_unknown': 0}
+    _stream_stats_lock = threading.Lock()
+    _single_flight = SingleFlight()
+
     def __init__(self):
         self.logger = AppLogger().get_logger()
-        self.session = requests.Session()
-        self.headers = {'User-Agent': random.choice(USER_AGENTS)}
+        self.cache = ResponseCache.get_cache() if CACHE_ENABLED else None
+        self.html_parser = HtmlParser.create()
 
     def scrap_with_requests(self, url, type_link):
+        return RequestsHelper._single_flight.do((type_link, normalize_url(url)),
+                                                lambda: self._scrap_with_requests(url, type_link))
+
+    def _scrap_with_requests(self, url, type_link):
+        cached = self._lookup_cache(url, type_link)
+        if cached and cached['is_fresh']:
+            self.logger.info(f'Scrap url: {url} served from cache')
+            return self._process_response(cached['content'], type_link)
         backoff_time = 5
+        limiter = RateLimiter.get_limiter(type_link)
         for _ in range(MAX_RETRIES):
             try:
-                self.headers['User-Agent'] = random.choice(USER_AGENTS)
-                response = self.session.get(url, headers=self.headers)
-                self.logger.info(f'Scrap url: {url} with status: {response.status_code}')
-                if response.status_code == StatusCode.SUCCESS.value:
-                    return self._process_response(response, type_link)
-                elif response.status_code == StatusCode.TOO_MANY_REQUESTS.value:
-                    self.logger.warning(f'Received a 429 status code. Retrying in {backoff_time} seconds...')
-                    # time.sleep(int(response.headers["Retry-After"]))
-                    time.sleep(backoff_time)
-                    backoff_time *= 2
-                elif response.status_code == StatusCode.FORBIDDEN.value:
-                    self.logger.warning('Received a 403 status code. Retrying...')
-                    time.sleep(random.uniform(1, 3))
-                    continue
-                else:
-                    self.logger.warning(f'Failed to fetch the page. Status code: {response.status_code}')
+                self._wait_for_rate_limit(limiter)
+                stream = self._should_stream(type_link)
+                with HttpClient.get_session().get(url, headers=self._build_headers(cached), timeout=REQUEST_TIMEOUT,
+                                                  stream=stream) as response:
+                    status_code = response.status_code
+                    self.logger.info(f'Scrap url: {url} with status: {status_code}')
+                    if status_code == StatusCode.NOT_MODIFIED.value and cached:
+                        limiter.on_success()
+                        self.cache.refresh(url, response.headers)
+                        return self._process_response(cached['content'], type_link)
+                    if status_code == StatusCode.SUCCESS.value:
+                        limiter.on_success()
+                        content = self._read_streamed(response, type_link) if stream else response.content
+                        return self._process_and_cache(url, type_link, content, response.headers)
+                    retry_after = self._update_limiter(limiter, status_code, response.headers.get('Retry-After'))
+                retry_delay = self._get_retry_delay(status_code, backoff_time, retry_after)
+                if retry_delay is None:
                     return None
+                time.sleep(retry_delay)
+                if status_code == StatusCode.TOO_MANY_REQUESTS.value:
+                    backoff_time *= 2
             except requests.RequestException as e:
                 self.logger.error(f'Request error: {e}')
                 time.sleep(backoff_time)
                 backoff_time *= 2
                 continue
-            finally:
-                self._close()
         self.logger.warning('Max retries reached. Exiting.')
         return None
 
-    def _process_response(self, response, type_link):
+    @staticmethod
+    def single_flight_stats():
+        return RequestsHelper._single_flight.stats()
+
+    @staticmethod
+    def streaming_stats():
+        with RequestsHelper._stream_stats_lock:
+            return dict(RequestsHelper._stream_stats)
+
+    @staticmethod
+    def _should_stream(type_link):
+        return STREAMING_FETCH_ENABLED and type_link.name in STREAMED_TYPE_LINKS
+
+    def _read_streamed(self, response, type_link):
+        buffer = bytearray()
+        scanner = EmbeddedJsonExtractor.payload_scanner(type_link)
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            buffer.extend(chunk)
+            payload_end = scanner.find_payload_end(buffer)
+            if payload_end is not None:
+                self._record_streamed_response(response.headers.get('Content-Length'), response.raw.tell(), True)
+                return bytes(buffer[:payload_end])
+        self._record_streamed_response(None, 0, False)
+        return bytes(buffer)
+
+    @staticmethod
+    def _record_streamed_response(content_length, bytes_read, payload_found):
+        with RequestsHelper._stream_stats_lock:
+            RequestsHelper._stream_stats['streamed'] += 1
+            if not payload_found:
+                return
+            if content_length and content_length.isdigit():
+                bytes_saved = max(0, int(content_length) - bytes_read)
+                if not bytes_saved:
+                    return
+                RequestsHelper._stream_stats['bytes_saved'] += bytes_saved
+            else:
+                RequestsHelper._stream_stats['bytes_saved_unknown'] += 1
+            RequestsHelper._stream_stats['stopped_early'] += 1
+
+    def _lookup_cache(self, url, type_link):
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.lookup(url, type_link)
+        except sqlite3.Error as e:
+            self.logger.error(f'Error while reading cache for {url}: {e}')
+            return None
+
+    def _process_and_cache(self, url, type_link, content, headers):
+        result = self._process_response(content, type_link)
+        if result is not None and self.cache is not None:
+            try:
+                self.cache.store(url, type_link, content, headers)
+            except sqlite3.Error as e:
+                self.logger.error(f'Error while writing cache for {url}: {e}')
+        return result
+
+    @staticmethod
+    def _build_headers(cached=None):
+        headers = {'User-Agent': random.choice(USER_AGENTS)}
+        headers.update(ResponseCache.conditional_headers(cached))
+        return headers
+
+    @staticmethod
+    def _wait_for_rate_limit(limiter):
+        while (wait := limiter.try_acquire()) > 0:
+            time.sleep(wait)
+
+    @staticmethod
+    def _update_limiter(limiter, status_code, retry_after_header):
+        retry_after = RateLimiter.parse_retry_after(retry_after_header)
+        if status_code in (StatusCode.TOO_MANY_REQUESTS.value, StatusCode.FORBIDDEN.value):
+            limiter.on_throttle(retry_after)
+        return retry_after
+
+    def _get_retry_delay(self, status_code, backoff_time, retry_after=None):
+        if status_code == StatusCode.TOO_MANY_REQUESTS.value:
+            retry_delay = retry_after if retry_after is not None else backoff_time
+            self.logger.warning(f'Received a 429 status code. Retrying in {retry_delay} seconds...')
+            return retry_delay
+        elif status_code == StatusCode.FORBIDDEN.value:
+            self.logger.warning('Received a 403 status code. Retrying...')
+            return random.uniform(1, 3)
+        self.logger.warning(f'Failed to fetch the page. Status code: {status_code}')
+        return None
+
+    def _process_response(self, content, type_link):
         match type_link:
             case TypeLink.BEATPORT_URL:
-                return self._beatport_scrapper(response.content)
+                return self._beatport_scrapper(content)
             case TypeLink.SOUNDCLOUD_URL:
-                return self._soundcloud_scrapper(response.content)
+                return self._soundcloud_scrapper(content)
             case TypeLink.BEATSTATS_URL:
-                return self._beatstats_scrapper(response.content)
+                return self._beatstats_scrapper(content)
             case TypeLink.BANDCAMP_URL:
-                return self._bandcamp_scrapper(response.content)
+                return self._bandcamp_scrapper(content)
 
     def _beatport_scrapper(self, content):
+        try:
+            data = EmbeddedJsonExtractor.extract_beatport_data(content)
+            if data is not None:
+                return data
+        except (ValueError, UnicodeDecodeError) as e:
+            self.logger.debug(f'Fast {BEATPORT_SCRIPT_ID} extraction failed, falling back to HTML parsing: {e}')
+        return self._beatport_soup_scrapper(content)
+
+    def _beatport_soup_scrapper(self, content):
         try:
             soup = BeautifulSoup(content, 'html.parser')
             script = soup.find('script', {'id': BEATPORT_SCRIPT_ID})
@@ -76,6 +197,15 @@ class RequestsHelper:
             return None
 
     def _soundcloud_scrapper(self, content):
+        try:
+            data = EmbeddedJsonExtractor.extract_soundcloud_data(content)
+            if data is not None:
+                return data
+        except (ValueError, UnicodeDecodeError) as e:
+            self.logger.debug(f'Fast {SOUNDCLOUD_SCRIPT_ID} extraction failed, falling back to HTML parsing: {e}')
+        return self._soundcloud_soup_scrapper(content)
+
+    def _soundcloud_soup_scrapper(self, content):
         try:
             soup = BeautifulSoup(content, 'html.parser')
             script = soup.find('script', text=lambda t: t and SOUNDCLOUD_SCRIPT_ID in t)
@@ -99,21 +229,14 @@ class RequestsHelper:
 
     def _beatstats_scrapper(self, content):
         try:
-            soup = BeautifulSoup(content, 'html.parser')
-            content_artists = soup.find(id="content-artists")
-            return [] if not content_artists else content_artists
+            return self.html_parser.parse_beatstats(content)
         except Exception as e:
             self.logger.error(f'Error while scrapping content: {e}')
             return None
 
     def _bandcamp_scrapper(self, content):
         try:
-            soup = BeautifulSoup(content, 'html.parser')
-            result_infos = soup.find_all(class_="result-info")
-            return [] if not result_infos else result_infos
+            return self.html_parser.parse_bandcamp(content)
         except Exception as e:
             self.logger.error(f'Error while scrapping content: {e}')
             return None
-
-    def _close(self):
-        self.session.close()
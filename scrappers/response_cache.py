@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from constants import CACHE_DB_FILE, CACHE_MAX_SIZE_BYTES, CACHE_TTL_SECONDS
+from enums import TypeLink
+from loggers import AppLogger
+
+
+class ResponseCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_file: str = CACHE_DB_FILE, max_size_bytes: int = CACHE_MAX_SIZE_BYTES):
+        self.logger = AppLogger.get_logger()
+        self.max_size_bytes = max_size_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, type_link TEXT, content BLOB, etag TEXT, last_modified TEXT, '
+            'fetched_at REAL, accessed_at REAL, size INTEGER)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)')
+        self.connection.commit()
+        self.total_size = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def get_cache() -> 'ResponseCache':
+        if ResponseCache._instance is None:
+            with ResponseCache._instance_lock:
+                if ResponseCache._instance is None:
+                    ResponseCache._instance = ResponseCache()
+        return ResponseCache._instance
+
+    def lookup(self, url: str, type_link: TypeLink) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT content, etag, last_modified, fetched_at FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return None
+            content, etag, last_modified, fetched_at = row
+            now = time.time()
+            is_fresh = now - fetched_at < CACHE_TTL_SECONDS.get(type_link.name, 0)
+            self.connection.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (now, url))
+            self.connection.commit()
+            if is_fresh:
+                self.hits += 1
+            return {'content': content, 'etag': etag, 'last_modified': last_modified, 'is_fresh': is_fresh}
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, type_link: TypeLink, content: bytes, headers):
+        now = time.time()
+        size = len(content)
+        with self.lock:
+            self.misses += 1
+            previous = self.connection.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+            self.connection.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, type_link, content, etag, last_modified, fetched_at, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, type_link.name, content, headers.get('ETag'), headers.get('Last-Modified'), now, now, size))
+            self.total_size += size - (previous[0] if previous else 0)
+            self._evict()
+            self.connection.commit()
+
+    def refresh(self, url: str, headers):
+        now = time.time()
+        with self.lock:
+            self.revalidated += 1
+            self.connection.execute(
+                'UPDATE responses SET fetched_at = ?, accessed_at = ?, '
+                'etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?',
+                (now, now, headers.get('ETag'), headers.get('Last-Modified'), url))
+            self.connection.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses,
+                    'evictions': self.evictions, 'size_bytes': self.total_size}
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+        with ResponseCache._instance_lock:
+            if ResponseCache._instance is self:
+                ResponseCache._instance = None
+
+    def _evict(self):
+        while self.total_size > self.max_size_bytes:
+            rows = self.connection.execute(
+                'SELECT url, size FROM responses ORDER BY accessed_at LIMIT 50').fetchall()
+            if not rows:
+                self.total_size = 0
+                return
+            for url, size in rows:
+                if self.total_size <= self.max_size_bytes:
+                    break
+                self.connection.execute('DELETE FROM responses WHERE url = ?', (url,))
+                self.total_size -= size
+                self.evictions += 1
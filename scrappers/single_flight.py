@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[Hashable, Dict[str, Any]] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self.lock:
+            call = self.calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self.calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not is_leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+        try:
+            call['result'] = fn()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call['event'].set()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {'executed': self.executed, 'coalesced': self.coalesced}
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self.calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self.calls[key] = future
+        self.executed += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self.calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {'executed': self.executed, 'coalesced': self.coalesced}
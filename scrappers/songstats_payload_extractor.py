@@ -0,0 +1,96 @@
+from typing import Any, Dict, Set
+from urllib.parse import urlsplit
+
+from constants import SONGSTATS_PAYLOAD_HOSTS
+from enums import TypeLink
+
+COUNTRY_KEYS = ('country', 'country_name', 'countryName')
+ENTITY_ID_KEYS = ('id', 'slug', 'songstatsLabelId')
+ENTITY_TYPES = ('label', 'artist', 'track', 'release', 'playlist')
+PAYLOAD_RESOURCE_TYPES = ('xhr', 'fetch')
+
+
+class SongstatsPayloadExtractor:
+    _link_patterns = {type_link.name: type_link.value for type_link in TypeLink if type_link != TypeLink.BANDCAMP_URL}
+
+    @staticmethod
+    def new_harvest(label_info: Dict[str, Any]) -> Dict[str, Any]:
+        return {'country': '', 'links': {}, 'matched': False,
+                'identifiers': SongstatsPayloadExtractor.get_label_identifiers(label_info)}
+
+    @staticmethod
+    def get_label_identifiers(label_info: Dict[str, Any]) -> Set[str]:
+        identifiers = {str(label_info[key]) for key in ENTITY_ID_KEYS if label_info.get(key)}
+        route = (label_info.get('routeInfo') or {}).get('url', '')
+        if route:
+            identifiers.add(route)
+            identifiers.update(segment for segment in route.strip('/').split('/')[1:] if segment)
+        return identifiers
+
+    @staticmethod
+    def is_label_payload(url: str, resource_type: str, content_type: str) -> bool:
+        return (resource_type in PAYLOAD_RESOURCE_TYPES and 'json' in content_type
+                and urlsplit(url).hostname in SONGSTATS_PAYLOAD_HOSTS)
+
+    @staticmethod
+    def is_complete(harvest: Dict[str, Any]) -> bool:
+        return harvest['matched']
+
+    @staticmethod
+    def merge_payload(data: Any, harvest: Dict[str, Any]):
+        stack = [data]
+        while stack and not harvest['matched']:
+            node = stack.pop()
+            if isinstance(node, dict):
+                if SongstatsPayloadExtractor._is_label_entity(node, harvest['identifiers']):
+                    SongstatsPayloadExtractor._merge_entity(node, harvest)
+                else:
+                    stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
+
+    @staticmethod
+    def _is_label_entity(node: Dict[str, Any], identifiers: Set[str]) -> bool:
+        if not identifiers or node.get('type', 'label') != 'label':
+            return False
+        route_info = node.get('routeInfo')
+        route = route_info.get('url') if isinstance(route_info, dict) else None
+        return route in identifiers or any(
+            str(node[key]) in identifiers for key in ENTITY_ID_KEYS if node.get(key) is not None)
+
+    @staticmethod
+    def _is_nested_entity(node: Dict[str, Any]) -> bool:
+        return 'routeInfo' in node or node.get('type') in ENTITY_TYPES
+
+    @staticmethod
+    def _merge_entity(entity: Dict[str, Any], harvest: Dict[str, Any]):
+        harvest['matched'] = True
+        SongstatsPayloadExtractor._merge_country(entity, harvest)
+        stack = list(reversed(list(entity.values())))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                if not SongstatsPayloadExtractor._is_nested_entity(node):
+                    stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, str) and node.startswith('http'):
+                SongstatsPayloadExtractor._merge_link(node, harvest)
+
+    @staticmethod
+    def _merge_country(node: Dict[str, Any], harvest: Dict[str, Any]):
+        for key in COUNTRY_KEYS:
+            value = node.get(key)
+            if isinstance(value, dict):
+                value = value.get('name')
+            if isinstance(value, str) and value:
+                harvest['country'] = value
+                return
+
+    @staticmethod
+    def _merge_link(url: str, harvest: Dict[str, Any]):
+        host = urlsplit(url).hostname or ''
+        for name, pattern in SongstatsPayloadExtractor._link_patterns.items():
+            if name not in harvest['links'] and (host == pattern or host.endswith(f'.{pattern}')):
+                harvest['links'][name] = url
+                return
@@ -0,0 +1,64 @@
+import random
+import threading
+import time
+from typing import Dict, List, Any
+
+from constants import SONGSTATS_URL, SONGSTATS_SESSION_TTL_SECONDS, USER_AGENTS
+from loggers import AppLogger
+
+EXCLUDED_HEADERS = {'cookie', 'content-length', 'host', 'connection', 'accept-encoding'}
+
+
+class SongstatsSession:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, ttl_seconds: int = SONGSTATS_SESSION_TTL_SECONDS):
+        self.logger = AppLogger.get_logger()
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.headers: Dict[str, str] = {}
+        self.cookies: Dict[str, str] = {}
+        self.expires_at = 0.0
+        self.anonymous_rejected = False
+
+    @staticmethod
+    def get_session() -> 'SongstatsSession':
+        if SongstatsSession._instance is None:
+            with SongstatsSession._instance_lock:
+                if SongstatsSession._instance is None:
+                    SongstatsSession._instance = SongstatsSession()
+        return SongstatsSession._instance
+
+    def can_use_api(self) -> bool:
+        with self.lock:
+            return self._has_valid_credentials() or not self.anonymous_rejected
+
+    def get_request_kwargs(self) -> Dict[str, Any]:
+        with self.lock:
+            if self._has_valid_credentials():
+                return {'headers': dict(self.headers), 'cookies': dict(self.cookies)}
+            return {'headers': {'User-Agent': random.choice(USER_AGENTS), 'Origin': SONGSTATS_URL,
+                                'Referer': f'{SONGSTATS_URL}/'}}
+
+    def store_credentials(self, headers: Dict[str, str], cookies: List[Dict[str, Any]]):
+        with self.lock:
+            self.headers = {name: value for name, value in headers.items()
+                            if not name.startswith(':') and name.lower() not in EXCLUDED_HEADERS}
+            self.cookies = {cookie['name']: cookie['value'] for cookie in cookies
+                            if cookie.get('domain', '').lstrip('.').endswith('songstats.com')}
+            self.expires_at = time.monotonic() + self.ttl_seconds
+            self.logger.info(f'Songstats session refreshed ({len(self.cookies)} cookies, '
+                             f'valid for {self.ttl_seconds}s)')
+
+    def reject(self):
+        with self.lock:
+            if self._has_valid_credentials():
+                self.headers = {}
+                self.cookies = {}
+                self.expires_at = 0.0
+            else:
+                self.anonymous_rejected = True
+
+    def _has_valid_credentials(self) -> bool:
+        return bool(self.headers) and time.monotonic() < self.expires_at
@@ -1,4 +1,5 @@
 import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 from fuzzywuzzy import fuzz
 
@@ -44,3 +45,75 @@ def format_title_case(text):
 def extract_number(value: str) -> int:
     match = re.search(r'\d+', value)
     return int(match.group()) if match else 0
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        host = f'{host}:{parts.port}'
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+A1_RANGE_PATTERN = re.compile(r'^(?:(?P<sheet>[^!]+)!)?(?P<start_col>[A-Z]*)(?P<start_row>\d*)'
+                              r'(?::(?P<end_col>[A-Z]*)(?P<end_row>\d*))?$')
+
+
+def column_to_index(column: str) -> int:
+    index = 0
+    for char in column:
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index
+
+
+def index_to_column(index: int) -> str:
+    column = ''
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        column = chr(ord('A') + remainder) + column
+    return column
+
+
+def parse_a1_range(a1_range: str) -> tuple:
+    match = A1_RANGE_PATTERN.match(a1_range.strip().upper().replace('$', ''))
+    if not match:
+        raise ValueError(f'Invalid A1 range: {a1_range}')
+    sheet = a1_range.split('!')[0].strip("'") if '!' in a1_range else None
+    start_col = column_to_index(match['start_col']) if match['start_col'] else None
+    start_row = int(match['start_row']) if match['start_row'] else None
+    if match['end_col'] is None and match['end_row'] is None:
+        return sheet, start_col, start_row, start_col, start_row
+    end_col = column_to_index(match['end_col']) if match['end_col'] else None
+    end_row = int(match['end_row']) if match['end_row'] else None
+    return sheet, start_col, start_row, end_col, end_row
+
+
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def to_cell_text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def to_typed_cell_value(value):
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value)
+    if text.upper() in ('TRUE', 'FALSE'):
+        return text.upper() == 'TRUE'
+    if NUMBER_PATTERN.fullmatch(text):
+        return float(text)
+    return text